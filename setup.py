@@ -29,7 +29,6 @@ setup(
     install_requires=[
         "paramiko>=2.11.0",
         "pyyaml>=6.0",
-        "jinja2>=3.0.0",
         "kubernetes>=25.0.0",
         "google-cloud-container>=2.17.0",
         "requests>=2.28.0",
@@ -43,6 +42,12 @@ setup(
             "pylint>=2.15.0",
             "mypy>=0.990",
         ],
+        "speedups": [
+            "orjson>=3.8.0",
+        ],
+        "async": [
+            "asyncssh>=2.13.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -4,22 +4,112 @@ This module provides the K6Manager class for generating, validating, and managin
 k6 load test scripts with multi-ecosystem support (npm, PyPI, Maven).
 """
 
+import functools
 import os
+import re
 import sys
 import json
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional
-from jinja2 import Template, TemplateError
+from typing import Dict, Any, List, Optional, Tuple
 
 from ...config import TestConfig, RegistriesConfig, TrafficConfig
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Matches "{{ name }}" and "{{ name | tojson }}" placeholders in the k6 template
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*(\|\s*tojson\s*)?\}\}")
+
+
+def _to_json(value: Any) -> str:
+    """Serialize a value as compact, deterministic JSON for the k6 script.
+
+    Uses orjson when it is installed and falls back to the stdlib otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    # orjson writes non-ASCII as UTF-8; match it so the script doesn't depend
+    # on which serializer is installed
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def _compile_template(template: str) -> List[Tuple[str, Optional[str], bool]]:
+    """Split a template into segments so rendering needs no parsing.
+
+    Args:
+        template: Template text containing ``{{ name }}`` placeholders.
+
+    Returns:
+        List of (literal text, placeholder name or None, tojson) segments.
+    """
+    parts = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        parts.append((template[pos:match.start()], match.group(1), bool(match.group(2))))
+        pos = match.end()
+    parts.append((template[pos:], None, False))
+    return parts
+
+
+def _render_template(
+    parts: List[Tuple[str, Optional[str], bool]], context: Dict[str, Any]
+) -> str:
+    """Render a compiled template in a single pass.
+
+    Args:
+        parts: Segments returned by ``_compile_template``.
+        context: Values for each placeholder name.
+
+    Returns:
+        Rendered template text.
+
+    Raises:
+        KeyError: If a placeholder has no value in the context.
+    """
+    out = []
+    for literal, name, tojson in parts:
+        out.append(literal)
+        if name is not None:
+            value = context[name]
+            out.append(_to_json(value) if tojson else str(value))
+    return ''.join(out)
+
+
+# Substrings every generated k6 script must contain, with the error for each
+_REQUIRED_SCRIPT_TOKENS = (
+    ("import http from 'k6/http'", "Missing required import: import http from 'k6/http'"),
+    ("import { check, sleep } from 'k6'", "Missing required import: import { check, sleep } from 'k6'"),
+    ("from 'k6/metrics'", "Missing required import: from 'k6/metrics'"),
+    ('export function setup()', "Missing required function: export function setup()"),
+    ('export default function', "Missing required function: export default function"),
+    ('export const options', "Missing required 'export const options'"),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _find_script_error(script_content: str) -> Optional[str]:
+    """Return the first validation error for a script, or None if it is valid.
+
+    Results are cached by script content, so re-validating an identical
+    generated script is a dictionary lookup.
+    """
+    for token, error in _REQUIRED_SCRIPT_TOKENS:
+        if token not in script_content:
+            return error
+    return None
+
 
 class K6Manager:
     """Manages k6 load test script generation and execution.
     
     This class handles:
-    - Embedding and rendering the k6 script template with Jinja2
+    - Embedding and rendering the k6 script template
     - Generating k6 scripts with parameterized configurations
     - Validating k6 script parameters
     - Preparing environment variables for k6 execution
@@ -87,7 +177,7 @@ const PYPI_RATIO = parseFloat(__ENV.PYPI_RATIO || '{{ pypi_ratio }}');
 const MAVEN_RATIO = parseFloat(__ENV.MAVEN_RATIO || '{{ maven_ratio }}');
 
 // Top 100 packages per ecosystem (known to exist)
-const PACKAGE_SEEDS = {{ package_seeds | tojson }};
+const PACKAGE_SEEDS = {{ package_seeds_json }};
 
 // Pre-fetched metadata (if available)
 const USE_PREFETCHED_METADATA = {{ use_prefetched_metadata | tojson }};
@@ -795,7 +885,7 @@ export default function (data) {
 
 export const options = {
   setupTimeout: '10m',
-  insecureSkipTLSVerify: {{ 'true' if not verify_ssl else 'false' }},
+  insecureSkipTLSVerify: {{ insecure_skip_tls_verify }},
   scenarios: {
     load_test: {
       executor: 'constant-arrival-rate',
@@ -809,6 +899,9 @@ export const options = {
 };
 """
     
+    # Template split into literal/placeholder segments once at class load
+    _TEMPLATE_PARTS = _compile_template(K6_SCRIPT_TEMPLATE)
+    
     # Default package seeds
     DEFAULT_PACKAGE_SEEDS = {
         'npm': [
@@ -855,6 +948,9 @@ export const options = {
         ]
     }
     
+    # Serialized default seeds, keyed by the tuple of selected ecosystems
+    _DEFAULT_SEEDS_JSON: Dict[Tuple[str, ...], str] = {}
+    
     def __init__(
         self,
         test_config: TestConfig,
@@ -882,6 +978,7 @@ export const options = {
         
         # Filter package seeds to only selected ecosystems
         all_seeds = package_seeds or self.DEFAULT_PACKAGE_SEEDS
+        self._uses_default_seeds = all_seeds is self.DEFAULT_PACKAGE_SEEDS
         self.package_seeds = {
             eco: all_seeds[eco] 
             for eco in registries_config.ecosystems 
@@ -905,6 +1002,18 @@ export const options = {
         self.vus = max(test_config.rps * avg_response_time // 2, 50)
         self.max_vus = max(test_config.rps * timeout_seconds, 100)
         
+        # String forms used by both the script template and the environment
+        self._rps_str = str(test_config.rps)
+        self._vus_str = str(self.vus)
+        self._max_vus_str = str(self.max_vus)
+        self._cache_hit_str = str(registries_config.cache_hit_percent)
+        self._npm_ratio_str = str(traffic_config.npm_ratio)
+        self._pypi_ratio_str = str(traffic_config.pypi_ratio)
+        self._maven_ratio_str = str(traffic_config.maven_ratio)
+        
+        # Environment shared by every load generator (all but LOAD_GEN_ID)
+        self._env_base = self._build_env_base()
+        
     def generate_script(self, output_path: Optional[str] = None) -> str:
         """Generate k6 load test script from template.
         
@@ -919,31 +1028,29 @@ export const options = {
             ValueError: If template rendering fails or validation fails.
         """
         try:
-            template = Template(self.K6_SCRIPT_TEMPLATE)
-            
             # Prepare template context
             context = {
                 'test_id': self.test_config.test_id,
-                'target_rps': self.test_config.rps,
+                'target_rps': self._rps_str,
                 'duration': self.test_config.duration,
-                'vus': self.vus,
-                'max_vus': self.max_vus,
+                'vus': self._vus_str,
+                'max_vus': self._max_vus_str,
                 'npm_url': self.registries_config.npm_url or '',
                 'pypi_url': self.registries_config.pypi_url or '',
                 'maven_url': self.registries_config.maven_url or '',
-                'cache_hit_pct': self.registries_config.cache_hit_percent,
-                'npm_ratio': self.traffic_config.npm_ratio,
-                'pypi_ratio': self.traffic_config.pypi_ratio,
-                'maven_ratio': self.traffic_config.maven_ratio,
+                'cache_hit_pct': self._cache_hit_str,
+                'npm_ratio': self._npm_ratio_str,
+                'pypi_ratio': self._pypi_ratio_str,
+                'maven_ratio': self._maven_ratio_str,
                 'metadata_only': 'true' if self.traffic_config.metadata_only else 'false',
-                'package_seeds': self.package_seeds,
+                'package_seeds_json': self._package_seeds_json(),
                 'ecosystems': self.registries_config.ecosystems,
                 'use_prefetched_metadata': len(self.pre_fetched_metadata) > 0,
                 'pre_fetched_metadata': self.pre_fetched_metadata,
                 'error_rate': self.error_rate,
                 'use_validation': len(self.validation_results) > 0,
                 'validation_results': self.validation_results,
-                'verify_ssl': self.test_config.verify_ssl,
+                'insecure_skip_tls_verify': 'false' if self.test_config.verify_ssl else 'true',
                 # Authentication credentials
                 'npm_token': self.registries_config.npm_token or '',
                 'npm_username': self.registries_config.npm_username or '',
@@ -955,8 +1062,8 @@ export const options = {
                 'maven_password': self.registries_config.maven_password or '',
             }
             
-            # Render template
-            script_content = template.render(**context)
+            # Render template (single pass over all placeholders)
+            script_content = _render_template(self._TEMPLATE_PARTS, context)
             
             # Validate generated script
             self.validate_script(script_content)
@@ -969,8 +1076,26 @@ export const options = {
                 
             return script_content
             
-        except TemplateError as e:
-            raise ValueError(f"Failed to render k6 script template: {e}") from e
+        except KeyError as e:
+            raise ValueError(
+                f"Failed to render k6 script template: missing value for {e}"
+            ) from e
+            
+    def _package_seeds_json(self) -> str:
+        """Serialize package seeds, reusing the cached JSON for default seeds.
+        
+        Returns:
+            Package seeds as a JSON string.
+        """
+        if not self._uses_default_seeds:
+            return _to_json(self.package_seeds)
+        
+        key = tuple(self.package_seeds)
+        seeds_json = self._DEFAULT_SEEDS_JSON.get(key)
+        if seeds_json is None:
+            seeds_json = _to_json(self.package_seeds)
+            self._DEFAULT_SEEDS_JSON[key] = seeds_json
+        return seeds_json
             
     def validate_script(self, script_content: str) -> bool:
         """Validate k6 script content.
@@ -984,49 +1109,28 @@ export const options = {
         Raises:
             ValueError: If script validation fails
         """
-        # Basic validation checks
-        required_imports = [
-            "import http from 'k6/http'",
-            "import { check, sleep } from 'k6'",
-            "from 'k6/metrics'"
-        ]
-        
-        for required_import in required_imports:
-            if required_import not in script_content:
-                raise ValueError(f"Missing required import: {required_import}")
-                
-        # Check for required functions
-        required_functions = ['export function setup()', 'export default function']
-        for func in required_functions:
-            if func not in script_content:
-                raise ValueError(f"Missing required function: {func}")
-                
-        # Check for options export
-        if 'export const options' not in script_content:
-            raise ValueError("Missing required 'export const options'")
+        error = _find_script_error(script_content)
+        if error is not None:
+            raise ValueError(error)
             
         return True
         
-    def prepare_environment(self, load_gen_id: str = "gen-1") -> Dict[str, str]:
-        """Prepare environment variables for k6 execution.
+    def _build_env_base(self) -> Dict[str, str]:
+        """Build the k6 environment variables that do not vary per load generator.
         
-        Args:
-            load_gen_id: Load generator identifier
-            
         Returns:
-            Dictionary of environment variables for k6
+            Dictionary of environment variables, excluding LOAD_GEN_ID
         """
         env_vars = {
             'TEST_ID': self.test_config.test_id,
-            'LOAD_GEN_ID': load_gen_id,
-            'TARGET_RPS': str(self.test_config.rps),
+            'TARGET_RPS': self._rps_str,
             'DURATION': self.test_config.duration,
-            'VUS': str(self.vus),
-            'MAX_VUS': str(self.max_vus),
-            'CACHE_HIT_PCT': str(self.registries_config.cache_hit_percent),
-            'NPM_RATIO': str(self.traffic_config.npm_ratio),
-            'PYPI_RATIO': str(self.traffic_config.pypi_ratio),
-            'MAVEN_RATIO': str(self.traffic_config.maven_ratio),
+            'VUS': self._vus_str,
+            'MAX_VUS': self._max_vus_str,
+            'CACHE_HIT_PCT': self._cache_hit_str,
+            'NPM_RATIO': self._npm_ratio_str,
+            'PYPI_RATIO': self._pypi_ratio_str,
+            'MAVEN_RATIO': self._maven_ratio_str,
             'METADATA_ONLY': 'true' if self.traffic_config.metadata_only else 'false',
         }
         
@@ -1060,13 +1164,24 @@ export const options = {
         
         return env_vars
         
+    def prepare_environment(self, load_gen_id: str = "gen-1") -> Dict[str, str]:
+        """Prepare environment variables for k6 execution.
+        
+        Args:
+            load_gen_id: Load generator identifier
+            
+        Returns:
+            Dictionary of environment variables for k6
+        """
+        return {**self._env_base, 'LOAD_GEN_ID': load_gen_id or 'gen-1'}
+        
     def get_k6_command(
         self, 
         script_path: str, 
         output_dir: str,
         load_gen_id: str = "gen-1",
         no_docker: bool = False
-    ) -> str:
+    ) -> List[str]:
         """Generate k6 command line for execution.
         
         Args:
@@ -1076,26 +1191,24 @@ export const options = {
             no_docker: If True, run k6 directly on local system without Docker
             
         Returns:
-            Complete k6 command as string
+            k6 command as an argument list, suitable for subprocess without a shell
         """
         env_vars = self.prepare_environment(load_gen_id)
         
-        # Build environment variable exports
-        env_exports = ' '.join([f'{k}={v}' for k, v in env_vars.items()])
-        
         # Build k6 command with JSON output
         results_file = os.path.join(
             output_dir, 
             f"{self.test_config.test_id}_{load_gen_id}_k6_results.json"
         )
         
-        k6_cmd = (
-            f"{env_exports} k6 run "
-            f"--out json={results_file} "
-            f"{script_path}"
-        )
+        cmd = ['k6', 'run', '--out', f'json={results_file}']
+        
+        # Pass environment variables through k6's --env flag
+        for key, value in env_vars.items():
+            cmd += ['-e', f'{key}={value}']
         
-        return k6_cmd
+        cmd.append(script_path)
+        return cmd
     
     def execute_k6(
         self,
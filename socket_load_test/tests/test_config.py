@@ -23,6 +23,22 @@ from socket_load_test.config import (
     TrafficConfig,
 )
 
+FAKE_KEY_FILE = "/fake/ssh/id_rsa"
+
+
+@pytest.fixture
+def fake_key_file(monkeypatch):
+    """Make FAKE_KEY_FILE appear to exist without writing to disk."""
+    real_exists = Path.exists
+
+    def exists(self, *args, **kwargs):
+        if str(self) == FAKE_KEY_FILE:
+            return True
+        return real_exists(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "exists", exists)
+    return FAKE_KEY_FILE
+
 
 class TestSSHServerConfig:
     """Tests for SSHServerConfig."""
@@ -93,20 +109,17 @@ class TestSSHServerConfig:
 class TestSSHInfraConfig:
     """Tests for SSHInfraConfig."""
 
-    def test_valid_config(self, tmp_path):
+    def test_valid_config(self, fake_key_file):
         """Test valid SSH infrastructure config."""
-        key_file = tmp_path / "id_rsa"
-        key_file.write_text("fake key")
-        
         firewall = SSHServerConfig(
             host="192.168.1.100",
             user="ubuntu",
-            key_file=str(key_file)
+            key_file=fake_key_file
         )
         gen1 = SSHServerConfig(
             host="192.168.1.101",
             user="ubuntu",
-            key_file=str(key_file)
+            key_file=fake_key_file
         )
         
         config = SSHInfraConfig(
@@ -115,15 +128,12 @@ class TestSSHInfraConfig:
         )
         config.validate()
 
-    def test_no_load_generators(self, tmp_path):
+    def test_no_load_generators(self, fake_key_file):
         """Test validation fails without load generators."""
-        key_file = tmp_path / "id_rsa"
-        key_file.write_text("fake key")
-        
         firewall = SSHServerConfig(
             host="192.168.1.100",
             user="ubuntu",
-            key_file=str(key_file)
+            key_file=fake_key_file
         )
         
         config = SSHInfraConfig(
@@ -248,11 +258,8 @@ class TestConfig:
     """Tests for Config class."""
 
     @pytest.fixture
-    def valid_ssh_config_dict(self, tmp_path):
+    def valid_ssh_config_dict(self, fake_key_file):
         """Fixture for valid SSH config dictionary."""
-        key_file = tmp_path / "id_rsa"
-        key_file.write_text("fake key")
-        
         return {
             "infrastructure": {
                 "type": "ssh",
@@ -260,13 +267,13 @@ class TestConfig:
                     "firewall_server": {
                         "host": "192.168.1.100",
                         "user": "ubuntu",
-                        "key_file": str(key_file)
+                        "key_file": fake_key_file
                     },
                     "load_generators": [
                         {
                             "host": "192.168.1.101",
                             "user": "ubuntu",
-                            "key_file": str(key_file)
+                            "key_file": fake_key_file
                         }
                     ]
                 }
@@ -419,17 +426,19 @@ class TestConfig:
         config = Config.from_dict(valid_ssh_config_dict)
         
         # Check defaults
-        assert config.traffic.cache_ratio == 30
-        assert config.traffic.npm_ratio == 40
-        assert config.traffic.pypi_ratio == 30
-        assert config.traffic.maven_ratio == 30
-        assert config.traffic.metadata_only is False
-        assert config.monitoring.enabled is True
-        assert config.monitoring.interval_seconds == 5
-        assert config.monitoring.node_exporter_port == 9100
-        assert config.results.output_dir == "./load-test-results"
-        assert config.results.auto_generate_html is True
-        assert config.results.auto_aggregate is True
+        assert (
+            config.traffic.cache_ratio,
+            config.traffic.npm_ratio,
+            config.traffic.pypi_ratio,
+            config.traffic.maven_ratio,
+            config.traffic.metadata_only,
+            config.monitoring.enabled,
+            config.monitoring.interval_seconds,
+            config.monitoring.node_exporter_port,
+            config.results.output_dir,
+            config.results.auto_generate_html,
+            config.results.auto_aggregate,
+        ) == (30, 40, 30, 30, False, True, 5, 9100, "./load-test-results", True, True)
 
     def test_minikube_config(self):
         """Test Minikube infrastructure config."""
@@ -1,20 +1,40 @@
 """Unit tests for k6_wrapper module."""
 
+import copy
 import json
 import os
-import tempfile
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
+from socket_load_test.core.load import k6_wrapper
 from socket_load_test.core.load.k6_wrapper import K6Manager
 from socket_load_test.config import TestConfig, RegistriesConfig, TrafficConfig
 
 
+# Environment expected from prepare_environment('gen-test') for the default fixtures
+EXPECTED_ENV = {
+    'TEST_ID': 'test-123',
+    'LOAD_GEN_ID': 'gen-test',
+    'TARGET_RPS': '1000',
+    'DURATION': '5m',
+    'VUS': '100',
+    'MAX_VUS': '333',
+    'NPM_URL': 'https://npm.example.com',
+    'PYPI_URL': 'https://pypi.example.com',
+    'MAVEN_URL': 'https://maven.example.com',
+    'CACHE_HIT_PCT': '30',
+    'NPM_RATIO': '40',
+    'PYPI_RATIO': '30',
+    'MAVEN_RATIO': '30',
+    'METADATA_ONLY': 'false',
+}
+
+
 class TestK6Manager:
     """Test suite for K6Manager class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope='session')
     def test_config(self):
         """Create test configuration."""
         return TestConfig(
@@ -26,7 +46,7 @@ class TestK6Manager:
             warmup_rps_percent=10
         )
     
-    @pytest.fixture
+    @pytest.fixture(scope='session')
     def registries_config(self):
         """Create registries configuration."""
         return RegistriesConfig(
@@ -36,7 +56,7 @@ class TestK6Manager:
             cache_hit_percent=30
         )
     
-    @pytest.fixture
+    @pytest.fixture(scope='session')
     def traffic_config(self):
         """Create traffic configuration."""
         return TrafficConfig(
@@ -47,15 +67,20 @@ class TestK6Manager:
             metadata_only=False
         )
     
-    @pytest.fixture
-    def k6_manager(self, test_config, registries_config, traffic_config):
-        """Create K6Manager instance."""
+    @pytest.fixture(scope='session')
+    def session_k6_manager(self, test_config, registries_config, traffic_config):
+        """Create K6Manager instance shared across the session."""
         return K6Manager(
             test_config=test_config,
             registries_config=registries_config,
             traffic_config=traffic_config
         )
     
+    @pytest.fixture
+    def k6_manager(self, session_k6_manager):
+        """Hand each test its own shallow copy of the shared K6Manager."""
+        return copy.copy(session_k6_manager)
+    
     def test_initialization(self, k6_manager, test_config, registries_config, traffic_config):
         """Test K6Manager initialization."""
         assert k6_manager.test_config == test_config
@@ -120,29 +145,25 @@ class TestK6Manager:
         assert '1000' in script  # RPS
         assert '5m' in script  # Duration
     
-    def test_generate_script_with_output(self, k6_manager):
+    def test_generate_script_with_output(self, k6_manager, tmp_path):
         """Test script generation with file output."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, 'test_script.js')
-            
-            script = k6_manager.generate_script(output_path)
-            
-            # Verify file was created
-            assert os.path.exists(output_path)
-            
-            # Verify file content matches returned content
-            with open(output_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-            assert file_content == script
+        output_path = tmp_path / 'test_script.js'
+        
+        script = k6_manager.generate_script(str(output_path))
+        
+        # Verify file was created
+        assert output_path.exists()
+        
+        # Verify file content matches returned content
+        assert output_path.read_text(encoding='utf-8') == script
     
-    def test_generate_script_creates_parent_dirs(self, k6_manager):
+    def test_generate_script_creates_parent_dirs(self, k6_manager, tmp_path):
         """Test that script generation creates parent directories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = os.path.join(tmpdir, 'subdir', 'nested', 'test_script.js')
-            
-            k6_manager.generate_script(output_path)
-            
-            assert os.path.exists(output_path)
+        output_path = tmp_path / 'subdir' / 'nested' / 'test_script.js'
+        
+        k6_manager.generate_script(str(output_path))
+        
+        assert output_path.exists()
     
     def test_generate_script_with_metadata_only(self, test_config, registries_config):
         """Test script generation with metadata_only flag."""
@@ -254,20 +275,7 @@ class TestK6Manager:
         env_vars = k6_manager.prepare_environment('gen-test')
         
         # Verify all required environment variables are present
-        assert env_vars['TEST_ID'] == 'test-123'
-        assert env_vars['LOAD_GEN_ID'] == 'gen-test'
-        assert env_vars['TARGET_RPS'] == '1000'
-        assert env_vars['DURATION'] == '5m'
-        assert env_vars['VUS'] == '100'
-        assert env_vars['MAX_VUS'] == '333'
-        assert env_vars['NPM_URL'] == 'https://npm.example.com'
-        assert env_vars['PYPI_URL'] == 'https://pypi.example.com'
-        assert env_vars['MAVEN_URL'] == 'https://maven.example.com'
-        assert env_vars['CACHE_HIT_PCT'] == '30'
-        assert env_vars['NPM_RATIO'] == '40'
-        assert env_vars['PYPI_RATIO'] == '30'
-        assert env_vars['MAVEN_RATIO'] == '30'
-        assert env_vars['METADATA_ONLY'] == 'false'
+        assert EXPECTED_ENV.items() <= env_vars.items()
     
     def test_prepare_environment_default_load_gen_id(self, k6_manager):
         """Test environment preparation with default load gen ID."""
@@ -290,35 +298,32 @@ class TestK6Manager:
         
         assert env_vars['METADATA_ONLY'] == 'true'
     
-    def test_get_k6_command(self, k6_manager):
+    def test_get_k6_command(self, k6_manager, tmp_path):
         """Test k6 command generation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            script_path = '/path/to/script.js'
-            
-            cmd = k6_manager.get_k6_command(script_path, tmpdir, 'gen-2')
-            
-            # Verify command structure
-            assert 'k6 run' in cmd
-            assert script_path in cmd
-            assert '--out json=' in cmd
-            
-            # Verify environment variables are in command
-            assert 'TEST_ID=test-123' in cmd
-            assert 'LOAD_GEN_ID=gen-2' in cmd
-            assert 'TARGET_RPS=1000' in cmd
-            assert 'DURATION=5m' in cmd
-            
-            # Verify output file path is correct
-            expected_output = os.path.join(tmpdir, 'test-123_gen-2_k6_results.json')
-            assert expected_output in cmd
+        script_path = '/path/to/script.js'
+        
+        cmd = k6_manager.get_k6_command(script_path, str(tmp_path), 'gen-2')
+        
+        # Verify command structure
+        assert cmd[:3] == ['k6', 'run', '--out']
+        assert cmd[-1] == script_path
+        
+        # Verify environment variables are in command
+        assert 'TEST_ID=test-123' in cmd
+        assert 'LOAD_GEN_ID=gen-2' in cmd
+        assert 'TARGET_RPS=1000' in cmd
+        assert 'DURATION=5m' in cmd
+        
+        # Verify output file path is correct
+        expected_output = str(tmp_path / 'test-123_gen-2_k6_results.json')
+        assert f'json={expected_output}' in cmd
     
-    def test_get_k6_command_default_load_gen_id(self, k6_manager):
+    def test_get_k6_command_default_load_gen_id(self, k6_manager, tmp_path):
         """Test k6 command with default load gen ID."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cmd = k6_manager.get_k6_command('/path/to/script.js', tmpdir)
-            
-            assert 'LOAD_GEN_ID=gen-1' in cmd
-            assert 'test-123_gen-1_k6_results.json' in cmd
+        cmd = k6_manager.get_k6_command('/path/to/script.js', str(tmp_path))
+        
+        assert 'LOAD_GEN_ID=gen-1' in cmd
+        assert cmd[3].endswith('test-123_gen-1_k6_results.json')
     
     def test_default_package_seeds_structure(self):
         """Test that default package seeds have correct structure."""
@@ -380,7 +385,7 @@ class TestK6Manager:
         assert script.count('export default function') == 1
         assert script.count('export const options') == 1
         
-        # Check that there are no unrendered Jinja2 templates
+        # Check that there are no unrendered template placeholders
         assert '{{' not in script
         assert '}}' not in script
         
@@ -427,3 +432,13 @@ class TestK6Manager:
         assert '50000' in high_script
         assert high_manager.vus == 5000
         assert high_manager.max_vus == 16666
+
+    def test_to_json_same_without_orjson(self, monkeypatch):
+        """Test that the stdlib fallback serializes exactly like orjson."""
+        value = {'name': 'caf\u00e9-\u5305', 'seeds': [1, 2.5, None], 'a': True}
+        expected = '{"a":true,"name":"caf\u00e9-\u5305","seeds":[1,2.5,null]}'
+        if k6_wrapper.orjson is not None:
+            assert k6_wrapper._to_json(value) == expected
+
+        monkeypatch.setattr(k6_wrapper, 'orjson', None)
+        assert k6_wrapper._to_json(value) == expected
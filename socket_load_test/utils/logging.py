@@ -2,40 +2,52 @@
 
 This module provides centralized logging configuration with support for:
 - Console and file output
+- Non-blocking handler I/O via a background queue listener
 - Configurable log levels
 - Sensitive data filtering (passwords, keys, tokens)
 - Structured logging with contextual information
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import re
 import sys
 from pathlib import Path
 from typing import Optional, Dict, Any
 
 
-# Sensitive patterns to filter from logs
-SENSITIVE_PATTERNS = [
-    # Password patterns
-    (re.compile(r'(password["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    # API keys
-    (re.compile(r'(key["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    (re.compile(r'(api[_-]?key["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    # Tokens
-    (re.compile(r'(token["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    (re.compile(r'(npm[_-]?token["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    (re.compile(r'(pypi[_-]?token["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    # Secrets
-    (re.compile(r'(secret["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
-    # Generic auth values
-    (re.compile(r'(auth["\']?\s*[:=]\s*["\']?)([^"\'}\s,]+)', re.IGNORECASE), r'\1***'),
+# Sensitive patterns to filter from logs, fused into a single alternation so
+# each message is scanned once. Every branch captures the prefix to keep in a
+# named group; the value that follows it is replaced with ***.
+SENSITIVE_PATTERN = re.compile(
+    # Passwords, API keys, tokens, secrets and generic auth values
+    r'(?P<kv>(?:password|api[_-]?key|key|npm[_-]?token|pypi[_-]?token|token|secret|auth)'
+    r'["\']?\s*[:=]\s*["\']?)[^"\'}\s,]+'
     # Authorization headers (Bearer, Basic)
-    (re.compile(r'(Authorization["\']?\s*[:=]\s*["\']?Bearer\s+)([^\s"\'}\],]+)', re.IGNORECASE), r'\1***'),
-    (re.compile(r'(Authorization["\']?\s*[:=]\s*["\']?Basic\s+)([^\s"\'}\],]+)', re.IGNORECASE), r'\1***'),
+    r'|(?P<authhdr>Authorization["\']?\s*[:=]\s*["\']?(?:Bearer|Basic)\s+)[^\s"\'}\],]+'
     # Command line arguments with tokens/passwords
-    (re.compile(r'(--[a-z-]*(?:token|password|key|secret)[=\s]+)([^\s]+)', re.IGNORECASE), r'\1***'),
-]
+    r'|(?P<cli>--[a-z-]*(?:token|password|key|secret)[=\s]+)[^\s]+',
+    re.IGNORECASE,
+)
+
+# Every branch of SENSITIVE_PATTERN contains one of these words, so text that
+# contains none of them can skip the regex entirely.
+SENSITIVE_KEYWORDS = ("password", "key", "token", "secret", "auth")
+
+# Level names accepted by setup_logging and set_log_level; anything else
+# falls back to INFO
+_LEVEL_MAP = {
+    name: getattr(logging, name)
+    for name in ("NOTSET", "DEBUG", "INFO", "WARN", "WARNING", "ERROR", "FATAL", "CRITICAL")
+}
+
+
+def _mask_match(match: "re.Match[str]") -> str:
+    """Keep the matched prefix and mask the sensitive value after it."""
+    return match.group(match.lastgroup) + "***"
 
 
 class SensitiveDataFilter(logging.Filter):
@@ -53,16 +65,17 @@ class SensitiveDataFilter(logging.Filter):
         if isinstance(record.msg, str):
             record.msg = self._filter_sensitive_data(record.msg)
         
-        # Also filter args if present
+        # Also filter string args; numbers and None can never match and are
+        # passed through without being stringified
         if record.args:
             if isinstance(record.args, dict):
                 record.args = {
-                    k: self._filter_sensitive_data(str(v)) if isinstance(v, str) else v
+                    k: self._filter_sensitive_data(v) if isinstance(v, str) else v
                     for k, v in record.args.items()
                 }
             elif isinstance(record.args, (list, tuple)):
                 record.args = tuple(
-                    self._filter_sensitive_data(str(arg)) if isinstance(arg, str) else arg
+                    self._filter_sensitive_data(arg) if isinstance(arg, str) else arg
                     for arg in record.args
                 )
         
@@ -78,9 +91,97 @@ class SensitiveDataFilter(logging.Filter):
         Returns:
             Filtered text with sensitive data replaced.
         """
-        for pattern, replacement in SENSITIVE_PATTERNS:
-            text = pattern.sub(replacement, text)
-        return text
+        lowered = text.lower()
+        if not any(keyword in lowered for keyword in SENSITIVE_KEYWORDS):
+            return text
+        return SENSITIVE_PATTERN.sub(_mask_match, text)
+
+
+class SensitiveFormatter(logging.Formatter):
+    """Formatter that removes sensitive data from formatted log output.
+
+    Filtering at format time only does the work for records that are actually
+    emitted, and scans the fully interpolated message once instead of the
+    message and each of its args separately.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record and mask any sensitive values in the result.
+
+        Args:
+            record: Log record to format.
+
+        Returns:
+            Formatted log line with sensitive data replaced.
+        """
+        return SensitiveDataFilter._filter_sensitive_data(super().format(record))
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches writes through a large write buffer.
+
+    ``StreamHandler`` flushes after every record, costing a write syscall per
+    log line. This handler only flushes for records at ``flush_level`` or
+    above; everything else is written when the buffer fills or the handler
+    is closed (``stop_logging`` does this at exit).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        buffer_size: int = 64 * 1024,
+        flush_level: int = logging.ERROR,
+    ):
+        """Initialize buffered file handler.
+
+        Args:
+            filename: Log file path.
+            mode: File open mode.
+            encoding: File encoding.
+            buffer_size: Write buffer size in bytes.
+            flush_level: Records at or above this level are flushed immediately.
+        """
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._defer_flush = False
+        super().__init__(filename, mode=mode, encoding=encoding)
+
+    def _open(self):
+        """Open the log file with the configured write buffer size."""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            # FileHandler.errors only exists on Python 3.9+
+            errors=getattr(self, "errors", None),
+        )
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Handle a record, deferring the flush for low-severity records.
+
+        Args:
+            record: Log record to handle.
+
+        Returns:
+            Whether the record passed the handler's filters.
+        """
+        # The handler lock is reentrant; holding it keeps the flag tied to
+        # this record when several threads log through the handler
+        with self.lock:
+            self._defer_flush = record.levelno < self.flush_level
+            try:
+                return super().handle(record)
+            finally:
+                self._defer_flush = False
+
+    def flush(self) -> None:
+        """Flush the buffer, unless called while writing a low-severity record."""
+        # StreamHandler.emit flushes after every record; skip those flushes
+        if not self._defer_flush:
+            super().flush()
 
 
 class ContextLogger(logging.LoggerAdapter):
@@ -94,6 +195,31 @@ class ContextLogger(logging.LoggerAdapter):
             extra: Extra context to add to all log messages.
         """
         super().__init__(logger, extra or {})
+        self._prefix = self._build_prefix(self.extra)
+
+    @staticmethod
+    def _build_prefix(extra: Dict[str, Any]) -> str:
+        """Build the context prefix prepended to every message.
+
+        Args:
+            extra: Context dictionary.
+
+        Returns:
+            Prefix string, or an empty string when there is no context.
+        """
+        if not extra:
+            return ""
+        context_parts = [f"{k}={v}" for k, v in extra.items()]
+        return f"[{' '.join(context_parts)}] "
+
+    def set_context(self, extra: Optional[Dict[str, Any]]) -> None:
+        """Replace the context added to log messages.
+
+        Args:
+            extra: New context dictionary.
+        """
+        self.extra = extra or {}
+        self._prefix = self._build_prefix(self.extra)
 
     def process(self, msg: str, kwargs: Dict[str, Any]) -> tuple:
         """Process log message to add context.
@@ -105,11 +231,36 @@ class ContextLogger(logging.LoggerAdapter):
         Returns:
             Tuple of (modified message, modified kwargs).
         """
-        # Add context prefix if available
-        if self.extra:
-            context_parts = [f"{k}={v}" for k, v in self.extra.items()]
-            msg = f"[{' '.join(context_parts)}] {msg}"
-        return msg, kwargs
+        # Context prefix is precomputed since extra is fixed per adapter; msg
+        # may be any object (e.g. an exception), so format rather than concat
+        if not self._prefix:
+            return msg, kwargs
+        return f"{self._prefix}{msg}", kwargs
+
+
+# Listener that owns the real handlers installed by setup_logging
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def stop_logging() -> None:
+    """Stop the background log listener, flushing and closing its handlers.
+
+    Safe to call more than once; registered with atexit so queued records are
+    written before the interpreter exits.
+    """
+    global _queue_listener
+
+    listener = _queue_listener
+    if listener is None:
+        return
+    _queue_listener = None
+
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_logging)
 
 
 def setup_logging(
@@ -117,6 +268,7 @@ def setup_logging(
     log_file: Optional[str] = None,
     verbose: bool = False,
     log_to_console: bool = True,
+    filter_sensitive: bool = True,
 ) -> logging.Logger:
     """Configure logging for the application.
 
@@ -125,25 +277,38 @@ def setup_logging(
         log_file: Optional file path for log output.
         verbose: If True, set level to DEBUG.
         log_to_console: If True, log to console.
+        filter_sensitive: If True, mask sensitive data in log output. Disable
+            only for local debugging where no secrets are configured.
 
     Returns:
         Configured root logger.
+
+    Note:
+        Console and file handlers are driven by a background
+        ``QueueListener``; the root logger only gets a ``QueueHandler`` (whose
+        ``listener`` attribute exposes the real handlers), so log calls never
+        block on stream or file I/O.
     """
+    global _queue_listener
+
     # Determine log level
     if verbose:
         level = "DEBUG"
     
-    log_level = getattr(logging, level.upper(), logging.INFO)
+    log_level = _LEVEL_MAP.get(level.upper(), logging.INFO)
     
     # Create root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
     # Remove existing handlers
+    stop_logging()
     root_logger.handlers.clear()
+    handlers = []
     
-    # Create formatter
-    formatter = logging.Formatter(
+    # Create formatter (optionally masking sensitive data in the output)
+    formatter_class = SensitiveFormatter if filter_sensitive else logging.Formatter
+    formatter = formatter_class(
         fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
@@ -153,19 +318,28 @@ def setup_logging(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        console_handler.addFilter(SensitiveDataFilter())
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Add file handler if requested
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        file_handler.addFilter(SensitiveDataFilter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Hand records to a background thread that owns the real handlers
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.listener = _queue_listener
+        root_logger.addHandler(queue_handler)
+        _queue_listener.start()
     
     return root_logger
 
@@ -180,12 +354,10 @@ def get_logger(name: str, context: Optional[Dict[str, Any]] = None) -> logging.L
     Returns:
         Logger instance (ContextLogger if context provided, else standard Logger).
     """
-    logger = logging.getLogger(name)
-    
     if context:
-        return ContextLogger(logger, context)
+        return ContextLogger(logging.getLogger(name), context)
     
-    return logger
+    return logging.getLogger(name)
 
 
 def set_log_level(level: str) -> None:
@@ -194,12 +366,16 @@ def set_log_level(level: str) -> None:
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
     """
-    log_level = getattr(logging, level.upper(), logging.INFO)
+    log_level = _LEVEL_MAP.get(level.upper(), logging.INFO)
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
     for handler in root_logger.handlers:
         handler.setLevel(log_level)
+        listener = getattr(handler, "listener", None)
+        if listener is not None:
+            for listener_handler in listener.handlers:
+                listener_handler.setLevel(log_level)
 
 
 def enable_debug_logging() -> None:
@@ -2,9 +2,12 @@
 
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import paramiko
 from paramiko.client import SSHClient
@@ -17,6 +20,55 @@ from socket_load_test.utils.validation import validate_hostname, validate_port
 
 logger = logging.getLogger(__name__)
 
+# Legacy SHA-1 key exchanges and DSA/SHA-1 RSA signatures are slow and weak;
+# paramiko's defaults already prefer curve25519 and ed25519 when offered.
+_DISABLED_ALGORITHMS = {
+    "kex": [
+        "diffie-hellman-group1-sha1",
+        "diffie-hellman-group14-sha1",
+        "diffie-hellman-group-exchange-sha1",
+    ],
+    "pubkeys": ["ssh-dss", "ssh-rsa"],
+}
+
+
+# Seconds between keepalive packets on pooled transports, so NAT and
+# firewall idle timeouts don't silently kill connections between uses
+_KEEPALIVE_INTERVAL = 30
+
+# Bytes requested per read when collecting command output
+_READ_CHUNK = 64 * 1024
+
+# SFTP flow-control window and packet size; paramiko's 2 MB default window
+# starves bulk uploads on high-latency links
+_SFTP_WINDOW_SIZE = 2 ** 27
+_SFTP_MAX_PACKET_SIZE = 32768
+
+def _read_stream(stream, max_bytes: Optional[int] = None) -> str:
+    """Read a command output stream in chunks and decode it once.
+
+    paramiko's ``read(size)`` only returns fewer than ``size`` bytes at EOF,
+    so a short chunk ends the loop without an extra read call.
+
+    Args:
+        stream: stdout or stderr file returned by ``exec_command``.
+        max_bytes: Keep at most this many bytes; the rest is read and dropped
+            so the remote command is not blocked on a full channel window.
+
+    Returns:
+        Decoded output, with undecodable bytes replaced.
+    """
+    buf = bytearray()
+    while True:
+        chunk = stream.read(_READ_CHUNK)
+        if max_bytes is None:
+            buf += chunk
+        elif len(buf) < max_bytes:
+            buf += chunk[: max_bytes - len(buf)]
+        if len(chunk) < _READ_CHUNK:
+            break
+    return buf.decode("utf-8", errors="replace")
+
 
 class SSHConnectionError(Exception):
     """Raised when SSH connection fails."""
@@ -36,6 +88,27 @@ class SSHTransferError(Exception):
     pass
 
 
+@dataclass
+class _PoolEntry:
+    """Pooled SSH client with liveness and idle bookkeeping.
+
+    Attributes:
+        client: Connected SSHClient.
+        last_used: Monotonic time the client was last handed out.
+        last_probe: Monotonic time the transport was last checked for liveness.
+        known_dirs: Remote directories known to exist on this connection.
+        sftp: SFTP session reused across transfers, opened on first use.
+        sftp_lock: Serializes use of the SFTP session.
+    """
+
+    client: SSHClient
+    last_used: float
+    last_probe: float
+    known_dirs: Set[str] = field(default_factory=set)
+    sftp: Optional[Any] = None
+    sftp_lock: Lock = field(default_factory=Lock)
+
+
 class SSHManager:
     """Manages SSH connections with connection pooling and SFTP support.
 
@@ -44,14 +117,33 @@ class SSHManager:
     lifecycle, command execution, and file transfers.
 
     Attributes:
-        _connections: Dictionary mapping host identifiers to SSHClient instances.
-        _lock: Thread lock for connection pool operations.
+        _connections: Dictionary mapping host identifiers to pool entries.
+        _lock: Thread lock guarding connection pool inserts and removals.
+        probe_interval: Seconds a pooled connection is trusted without
+            re-checking its transport.
+        idle_timeout: Seconds after which an unused connection is closed, or
+            None to keep connections until closed explicitly.
     """
 
-    def __init__(self):
-        """Initialize the SSH manager with an empty connection pool."""
-        self._connections: Dict[str, SSHClient] = {}
+    def __init__(
+        self,
+        probe_interval: float = 5.0,
+        idle_timeout: Optional[float] = None,
+    ):
+        """Initialize the SSH manager with an empty connection pool.
+
+        Args:
+            probe_interval: Seconds between transport liveness checks when
+                reusing a pooled connection (default: 5).
+            idle_timeout: Close connections unused for this many seconds
+                (default: None, never expire).
+        """
+        self._connections: Dict[str, _PoolEntry] = {}
         self._lock = Lock()
+        # key_file argument -> validated, expanded path
+        self._key_file_cache: Dict[str, str] = {}
+        self.probe_interval = probe_interval
+        self.idle_timeout = idle_timeout
 
     def _get_host_key(
         self, host: str, port: int = 22, user: str = "root"
@@ -68,6 +160,74 @@ class SSHManager:
         """
         return f"{user}@{host}:{port}"
 
+    def _get_entry(self, host_key: str) -> _PoolEntry:
+        """Look up a pool entry without taking the pool lock.
+
+        A single ``dict.get`` is atomic, so readers never contend with each
+        other; the lock only guards inserts and removals.
+
+        Args:
+            host_key: Key returned by ``_get_host_key``.
+
+        Returns:
+            Pool entry for the host.
+
+        Raises:
+            SSHConnectionError: If there is no pooled connection for the host.
+        """
+        entry = self._connections.get(host_key)
+        if entry is None:
+            raise SSHConnectionError(
+                f"No active connection to {host_key}. Call connect() first."
+            )
+        entry.last_used = time.monotonic()
+        return entry
+
+    def _get_client(self, host_key: str) -> SSHClient:
+        """Look up a pooled client without taking the pool lock.
+
+        Args:
+            host_key: Key returned by ``_get_host_key``.
+
+        Returns:
+            Pooled SSHClient for the host.
+
+        Raises:
+            SSHConnectionError: If there is no pooled connection for the host.
+        """
+        return self._get_entry(host_key).client
+
+    def _is_expired(self, entry: _PoolEntry, now: float) -> bool:
+        """Check whether a pooled connection has been idle too long.
+
+        Args:
+            entry: Pool entry to check.
+            now: Current monotonic time.
+
+        Returns:
+            True if the entry exceeded the idle timeout.
+        """
+        return self.idle_timeout is not None and now - entry.last_used > self.idle_timeout
+
+    def _discard(self, host_key: str) -> None:
+        """Close and remove a pooled connection. Caller must hold the lock.
+
+        Waits for an in-flight transfer on the connection to finish rather
+        than closing its SFTP session underneath it.
+
+        Args:
+            host_key: Key of the connection to remove.
+        """
+        entry = self._connections.pop(host_key, None)
+        if entry is None:
+            return
+        with entry.sftp_lock:
+            self._close_sftp(entry)
+            try:
+                entry.client.close()
+            except Exception as e:
+                logger.warning(f"Error closing connection to {host_key}: {e}")
+
     def connect(
         self,
         host: str,
@@ -104,21 +264,31 @@ class SSHManager:
 
         with self._lock:
             # Return existing connection if available and active
-            if host_key in self._connections:
-                client = self._connections[host_key]
-                try:
-                    # Test if connection is still alive
-                    transport = client.get_transport()
-                    if transport and transport.is_active():
-                        logger.debug(f"Reusing existing connection to {host_key}")
-                        return client
-                    else:
-                        # Connection is dead, remove it
-                        logger.debug(f"Removing dead connection to {host_key}")
-                        del self._connections[host_key]
-                except Exception:
-                    # Connection is invalid, remove it
-                    del self._connections[host_key]
+            entry = self._connections.get(host_key)
+            if entry is not None:
+                now = time.monotonic()
+                if self._is_expired(entry, now):
+                    logger.debug(f"Closing idle connection to {host_key}")
+                    self._discard(host_key)
+                elif now - entry.last_probe < self.probe_interval:
+                    # Probed recently; skip the transport check
+                    entry.last_used = now
+                    return entry.client
+                else:
+                    try:
+                        # Test if connection is still alive
+                        transport = entry.client.get_transport()
+                        if transport and transport.is_active():
+                            logger.debug(f"Reusing existing connection to {host_key}")
+                            entry.last_used = entry.last_probe = now
+                            return entry.client
+                        else:
+                            # Connection is dead, remove it
+                            logger.debug(f"Removing dead connection to {host_key}")
+                            self._discard(host_key)
+                    except Exception:
+                        # Connection is invalid, remove it
+                        self._discard(host_key)
 
             # Create new connection
             client = SSHClient()
@@ -131,25 +301,17 @@ class SSHManager:
                     "port": port,
                     "username": user,
                     "timeout": timeout,
+                    "disabled_algorithms": _DISABLED_ALGORITHMS,
                 }
 
                 # Add authentication method
                 if key_file:
-                    # Validate key file exists and has correct permissions
-                    key_path = Path(key_file).expanduser()
-                    if not key_path.exists():
-                        raise SSHConnectionError(f"SSH key file not found: {key_file}")
-
-                    # Check permissions (should be 600)
-                    if os.name != "nt":  # Unix-like systems
-                        mode = key_path.stat().st_mode & 0o777
-                        if mode != 0o600:
-                            logger.warning(
-                                f"SSH key {key_file} has permissions {oct(mode)}, "
-                                "should be 600 for security"
-                            )
-
-                    connect_kwargs["key_filename"] = str(key_path)
+                    key_filename = self._key_file_cache.get(key_file)
+                    if key_filename is None:
+                        key_filename = self._validate_key_file(key_file)
+                        self._key_file_cache[key_file] = key_filename
+
+                    connect_kwargs["key_filename"] = key_filename
                     logger.debug(f"Connecting to {host_key} using key file")
                 else:
                     connect_kwargs["password"] = password
@@ -159,11 +321,19 @@ class SSHManager:
                 client.connect(**connect_kwargs)
                 logger.info(f"Successfully connected to {host_key}")
 
+                transport = client.get_transport()
+                if transport is not None:
+                    transport.set_keepalive(_KEEPALIVE_INTERVAL)
+
                 # Store in pool
-                self._connections[host_key] = client
+                now = time.monotonic()
+                self._connections[host_key] = _PoolEntry(client, now, now)
                 return client
 
             except AuthenticationException as e:
+                # The key may have been replaced; re-validate on next attempt
+                if key_file:
+                    self._key_file_cache.pop(key_file, None)
                 raise SSHConnectionError(
                     f"Authentication failed for {host_key}: {e}"
                 ) from e
@@ -174,6 +344,34 @@ class SSHManager:
                     f"Failed to connect to {host_key}: {e}"
                 ) from e
 
+    @staticmethod
+    def _validate_key_file(key_file: str) -> str:
+        """Check that an SSH key file exists and warn about loose permissions.
+
+        Args:
+            key_file: Path to SSH private key file.
+
+        Returns:
+            Expanded key file path.
+
+        Raises:
+            SSHConnectionError: If the key file does not exist.
+        """
+        key_path = Path(key_file).expanduser()
+        if not key_path.exists():
+            raise SSHConnectionError(f"SSH key file not found: {key_file}")
+
+        # Check permissions (should be 600)
+        if os.name != "nt":  # Unix-like systems
+            mode = key_path.stat().st_mode & 0o777
+            if mode != 0o600:
+                logger.warning(
+                    f"SSH key {key_file} has permissions {oct(mode)}, "
+                    "should be 600 for security"
+                )
+
+        return str(key_path)
+
     def execute_command(
         self,
         host: str,
@@ -181,6 +379,7 @@ class SSHManager:
         port: int = 22,
         user: str = "root",
         timeout: int = 30,
+        max_output_bytes: Optional[int] = None,
     ) -> Tuple[str, str, int]:
         """Execute a command over SSH.
 
@@ -190,6 +389,8 @@ class SSHManager:
             port: SSH port number (default: 22).
             user: Username for authentication (default: root).
             timeout: Command execution timeout in seconds (default: 30).
+            max_output_bytes: Truncate stdout and stderr to this many bytes
+                each (default: None, no limit).
 
         Returns:
             Tuple of (stdout, stderr, exit_code).
@@ -199,21 +400,83 @@ class SSHManager:
             SSHConnectionError: If connection is not established.
         """
         host_key = self._get_host_key(host, port, user)
+        client = self._get_client(host_key)
+        return self._run_command(client, host_key, command, timeout, max_output_bytes)
 
-        with self._lock:
-            if host_key not in self._connections:
-                raise SSHConnectionError(
-                    f"No active connection to {host_key}. Call connect() first."
+    def execute_commands_batch(
+        self,
+        host: str,
+        commands: List[str],
+        port: int = 22,
+        user: str = "root",
+        timeout: int = 30,
+        max_workers: int = 8,
+    ) -> List[Tuple[str, str, int]]:
+        """Execute several commands concurrently over one SSH connection.
+
+        Each command runs in its own channel on the pooled transport, so the
+        batch takes roughly as long as its slowest command instead of the sum
+        of all of them.
+
+        Args:
+            host: Hostname or IP address.
+            commands: Commands to execute.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+            timeout: Per-command execution timeout in seconds (default: 30).
+            max_workers: Maximum number of channels open at once (default: 8).
+
+        Returns:
+            List of (stdout, stderr, exit_code) tuples, in the order of commands.
+
+        Raises:
+            SSHCommandError: If any command execution fails.
+            SSHConnectionError: If connection is not established.
+        """
+        host_key = self._get_host_key(host, port, user)
+        client = self._get_client(host_key)
+
+        if not commands:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(commands))) as pool:
+            return list(
+                pool.map(
+                    lambda command: self._run_command(client, host_key, command, timeout),
+                    commands,
                 )
-            client = self._connections[host_key]
+            )
+
+    def _run_command(
+        self,
+        client: SSHClient,
+        host_key: str,
+        command: str,
+        timeout: int,
+        max_output_bytes: Optional[int] = None,
+    ) -> Tuple[str, str, int]:
+        """Run a command on a connected client and collect its output.
+
+        Args:
+            client: Connected SSHClient.
+            host_key: Connection key, used in log and error messages.
+            command: Command to execute.
+            timeout: Command execution timeout in seconds.
+            max_output_bytes: Optional per-stream output size limit.
 
+        Returns:
+            Tuple of (stdout, stderr, exit_code).
+
+        Raises:
+            SSHCommandError: If command execution fails.
+        """
         try:
             logger.debug(f"Executing command on {host_key}: {command[:100]}")
             stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
 
             # Read output
-            stdout_data = stdout.read().decode("utf-8", errors="replace")
-            stderr_data = stderr.read().decode("utf-8", errors="replace")
+            stdout_data = _read_stream(stdout, max_output_bytes)
+            stderr_data = _read_stream(stderr, max_output_bytes)
             exit_code = stdout.channel.recv_exit_status()
 
             if exit_code != 0:
@@ -260,47 +523,95 @@ class SSHManager:
         if not local_file.exists():
             raise FileNotFoundError(f"Local file not found: {local_path}")
 
-        with self._lock:
-            if host_key not in self._connections:
-                raise SSHConnectionError(
-                    f"No active connection to {host_key}. Call connect() first."
-                )
-            client = self._connections[host_key]
+        entry = self._get_entry(host_key)
 
-        try:
-            logger.debug(f"Transferring {local_path} to {host_key}:{remote_path}")
-            sftp = client.open_sftp()
+        # One SFTP session per connection; it must not be used concurrently
+        with entry.sftp_lock:
+            try:
+                logger.debug(f"Transferring {local_path} to {host_key}:{remote_path}")
+                sftp = self._get_sftp(entry)
+
+                # Create remote directory if it isn't already known to exist
+                remote_dir = os.path.dirname(remote_path)
+                if remote_dir and remote_dir not in entry.known_dirs:
+                    try:
+                        sftp.stat(remote_dir)
+                        entry.known_dirs.add(remote_dir)
+                    except FileNotFoundError:
+                        # Directory doesn't exist, create it
+                        logger.debug(f"Creating remote directory: {remote_dir}")
+                        self._create_remote_directory(sftp, remote_dir, entry.known_dirs)
+
+                # Transfer file; skip the post-upload stat round trip
+                with local_file.open("rb") as fl:
+                    sftp.putfo(
+                        fl,
+                        remote_path,
+                        file_size=local_file.stat().st_size,
+                        confirm=False,
+                    )
+                logger.info(f"Successfully transferred {local_path} to {host_key}:{remote_path}")
 
-            # Create remote directory if it doesn't exist
-            remote_dir = os.path.dirname(remote_path)
-            if remote_dir:
-                try:
-                    sftp.stat(remote_dir)
-                except FileNotFoundError:
-                    # Directory doesn't exist, create it
-                    logger.debug(f"Creating remote directory: {remote_dir}")
-                    self._create_remote_directory(sftp, remote_dir)
+            except Exception as e:
+                # Don't reuse a session that may be left in a bad state, and
+                # re-check directories since one may have been removed remotely
+                self._close_sftp(entry)
+                entry.known_dirs.clear()
+                raise SSHTransferError(
+                    f"Failed to transfer file to {host_key}: {e}"
+                ) from e
 
-            # Transfer file
-            sftp.put(str(local_file), remote_path)
-            logger.info(f"Successfully transferred {local_path} to {host_key}:{remote_path}")
+    def _get_sftp(self, entry: _PoolEntry):
+        """Return the cached SFTP session for a connection, opening it if needed.
 
-            sftp.close()
+        Caller must hold ``entry.sftp_lock``.
 
-        except Exception as e:
-            raise SSHTransferError(
-                f"Failed to transfer file to {host_key}: {e}"
-            ) from e
+        Args:
+            entry: Pool entry for the connection.
 
-    def _create_remote_directory(self, sftp, remote_dir: str) -> None:
+        Returns:
+            Open SFTPClient.
+        """
+        if entry.sftp is None:
+            # Enlarge only the SFTP channel's window; the transport defaults
+            # still apply to exec_command channels on the same connection
+            entry.sftp = paramiko.SFTPClient.from_transport(
+                entry.client.get_transport(),
+                window_size=_SFTP_WINDOW_SIZE,
+                max_packet_size=_SFTP_MAX_PACKET_SIZE,
+            )
+        return entry.sftp
+
+    @staticmethod
+    def _close_sftp(entry: _PoolEntry) -> None:
+        """Close and forget a connection's cached SFTP session, if any.
+
+        Args:
+            entry: Pool entry for the connection.
+        """
+        sftp, entry.sftp = entry.sftp, None
+        if sftp is not None:
+            try:
+                sftp.close()
+            except Exception as e:
+                logger.debug(f"Error closing SFTP session: {e}")
+
+    def _create_remote_directory(
+        self, sftp, remote_dir: str, known_dirs: Optional[Set[str]] = None
+    ) -> None:
         """Recursively create remote directory.
 
         Args:
             sftp: Active SFTP client.
             remote_dir: Remote directory path to create.
+            known_dirs: Directories already known to exist; skipped without a
+                round trip and updated with every directory checked or created.
         """
+        if known_dirs is None:
+            known_dirs = set()
+
         dirs = []
-        while remote_dir and remote_dir != "/":
+        while remote_dir and remote_dir != "/" and remote_dir not in known_dirs:
             dirs.append(remote_dir)
             remote_dir = os.path.dirname(remote_dir)
 
@@ -310,6 +621,7 @@ class SSHManager:
                 sftp.stat(directory)
             except FileNotFoundError:
                 sftp.mkdir(directory)
+            known_dirs.add(directory)
 
     def close(
         self, host: str, port: int = 22, user: str = "root"
@@ -325,25 +637,35 @@ class SSHManager:
 
         with self._lock:
             if host_key in self._connections:
-                try:
-                    self._connections[host_key].close()
-                    logger.debug(f"Closed connection to {host_key}")
-                except Exception as e:
-                    logger.warning(f"Error closing connection to {host_key}: {e}")
-                finally:
-                    del self._connections[host_key]
+                self._discard(host_key)
+                logger.debug(f"Closed connection to {host_key}")
 
     def close_all(self) -> None:
-        """Close all SSH connections in the pool."""
+        """Close all SSH connections in the pool.
+
+        The pool is emptied under the lock, then the connections are closed
+        concurrently so shutdown is not serialized on each socket teardown.
+        """
         with self._lock:
-            for host_key, client in list(self._connections.items()):
+            entries = list(self._connections.items())
+            self._connections.clear()
+
+        def _close(item: Tuple[str, _PoolEntry]) -> None:
+            host_key, entry = item
+            with entry.sftp_lock:
+                self._close_sftp(entry)
                 try:
-                    client.close()
+                    entry.client.close()
                     logger.debug(f"Closed connection to {host_key}")
                 except Exception as e:
                     logger.warning(f"Error closing connection to {host_key}: {e}")
-            self._connections.clear()
-            logger.info("Closed all SSH connections")
+
+        if len(entries) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(entries))) as pool:
+                list(pool.map(_close, entries))
+        elif entries:
+            _close(entries[0])
+        logger.info("Closed all SSH connections")
 
     def get_active_connections(self) -> list[str]:
         """Get list of active connection identifiers.
@@ -352,6 +674,13 @@ class SSHManager:
             List of host keys for active connections.
         """
         with self._lock:
+            # Lazily sweep connections that have been idle too long
+            if self.idle_timeout is not None:
+                now = time.monotonic()
+                for host_key, entry in list(self._connections.items()):
+                    if self._is_expired(entry, now):
+                        logger.debug(f"Closing idle connection to {host_key}")
+                        self._discard(host_key)
             return list(self._connections.keys())
 
     def __enter__(self):
@@ -0,0 +1,399 @@
+"""Asyncio SSH connection manager built on asyncssh.
+
+Provides the same connection pooling, command execution, and file transfer
+operations as ``SSHManager``, but multiplexes every connection on a single
+event loop instead of dedicating a thread to each. Use it for large fan-out
+across many hosts.
+
+asyncssh is an optional dependency (``pip install socket-load-test[async]``).
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import asyncssh
+except ImportError:  # pragma: no cover - optional dependency
+    asyncssh = None
+
+from socket_load_test.utils.ssh_manager import (
+    _DISABLED_ALGORITHMS,
+    SSHCommandError,
+    SSHConnectionError,
+    SSHTransferError,
+)
+from socket_load_test.utils.validation import validate_hostname, validate_port
+
+logger = logging.getLogger(__name__)
+
+# Same restrictions as SSHManager, in asyncssh's "-" syntax for removing
+# algorithms from its defaults. ssh-dss is not an asyncssh default, so only
+# ssh-rsa (SHA-1) host key signatures need dropping.
+_KEX_ALGS = "-" + ",".join(_DISABLED_ALGORITHMS["kex"])
+_SERVER_HOST_KEY_ALGS = "-ssh-rsa"
+
+
+class AsyncSSHManager:
+    """Manages asyncssh connections with connection pooling and SFTP support.
+
+    Attributes:
+        _connections: Dictionary mapping host identifiers to connections.
+        _host_locks: Per-host locks so concurrent connects to one host share
+            a single handshake without blocking other hosts.
+        _sftp_clients: SFTP client reused across transfers, per host key.
+    """
+
+    def __init__(self):
+        """Initialize the async SSH manager with an empty connection pool.
+
+        Raises:
+            ImportError: If asyncssh is not installed.
+        """
+        if asyncssh is None:
+            raise ImportError(
+                "AsyncSSHManager requires asyncssh. "
+                "Install it with: pip install socket-load-test[async]"
+            )
+        self._connections: Dict[str, "asyncssh.SSHClientConnection"] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._sftp_clients: Dict[str, "asyncssh.SFTPClient"] = {}
+
+    def _get_host_key(
+        self, host: str, port: int = 22, user: str = "root"
+    ) -> str:
+        """Generate a unique key for a host connection.
+
+        Args:
+            host: Hostname or IP address.
+            port: SSH port number.
+            user: Username for authentication.
+
+        Returns:
+            Unique string key for the connection.
+        """
+        return f"{user}@{host}:{port}"
+
+    def _host_lock(self, host_key: str) -> asyncio.Lock:
+        """Return the lock for a host, creating it on first use.
+
+        Created here rather than in __init__ so the lock binds to the running
+        loop on Python < 3.10.
+
+        Args:
+            host_key: Key returned by ``_get_host_key``.
+
+        Returns:
+            Lock serializing connect and SFTP setup for the host.
+        """
+        lock = self._host_locks.get(host_key)
+        if lock is None:
+            lock = self._host_locks[host_key] = asyncio.Lock()
+        return lock
+
+    def _get_connection(self, host_key: str) -> "asyncssh.SSHClientConnection":
+        """Look up a pooled connection.
+
+        Args:
+            host_key: Key returned by ``_get_host_key``.
+
+        Returns:
+            Pooled connection for the host.
+
+        Raises:
+            SSHConnectionError: If there is no pooled connection for the host.
+        """
+        conn = self._connections.get(host_key)
+        if conn is None:
+            raise SSHConnectionError(
+                f"No active connection to {host_key}. Call connect() first."
+            )
+        return conn
+
+    async def connect(
+        self,
+        host: str,
+        port: int = 22,
+        user: str = "root",
+        password: Optional[str] = None,
+        key_file: Optional[str] = None,
+        timeout: int = 10,
+    ) -> "asyncssh.SSHClientConnection":
+        """Establish or retrieve SSH connection.
+
+        Args:
+            host: Hostname or IP address.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+            password: Password for authentication (optional).
+            key_file: Path to SSH private key file (optional).
+            timeout: Connection timeout in seconds (default: 10).
+
+        Returns:
+            Connected asyncssh connection.
+
+        Raises:
+            SSHConnectionError: If connection fails.
+            ValueError: If neither password nor key_file is provided.
+        """
+        validate_hostname(host, "host")
+        validate_port(port, "port")
+
+        if not password and not key_file:
+            raise ValueError("Either password or key_file must be provided")
+
+        host_key = self._get_host_key(host, port, user)
+
+        async with self._host_lock(host_key):
+            conn = self._connections.get(host_key)
+            if conn is not None:
+                if not conn.is_closed():
+                    logger.debug(f"Reusing existing connection to {host_key}")
+                    return conn
+                logger.debug(f"Removing dead connection to {host_key}")
+                del self._connections[host_key]
+                self._sftp_clients.pop(host_key, None)
+
+            # Host keys are not verified, matching SSHManager's AutoAddPolicy
+            connect_kwargs = {
+                "port": port,
+                "username": user,
+                "known_hosts": None,
+                "connect_timeout": timeout,
+                "kex_algs": _KEX_ALGS,
+                "server_host_key_algs": _SERVER_HOST_KEY_ALGS,
+            }
+
+            if key_file:
+                key_path = Path(key_file).expanduser()
+                if not key_path.exists():
+                    raise SSHConnectionError(f"SSH key file not found: {key_file}")
+                connect_kwargs["client_keys"] = [str(key_path)]
+                logger.debug(f"Connecting to {host_key} using key file")
+            else:
+                connect_kwargs["password"] = password
+                connect_kwargs["client_keys"] = None
+                logger.debug(f"Connecting to {host_key} using password")
+
+            try:
+                conn = await asyncssh.connect(host, **connect_kwargs)
+            except asyncssh.PermissionDenied as e:
+                raise SSHConnectionError(
+                    f"Authentication failed for {host_key}: {e}"
+                ) from e
+            except asyncssh.Error as e:
+                raise SSHConnectionError(f"SSH error connecting to {host_key}: {e}") from e
+            except Exception as e:
+                raise SSHConnectionError(
+                    f"Failed to connect to {host_key}: {e}"
+                ) from e
+
+            logger.info(f"Successfully connected to {host_key}")
+            self._connections[host_key] = conn
+            return conn
+
+    async def execute_command(
+        self,
+        host: str,
+        command: str,
+        port: int = 22,
+        user: str = "root",
+        timeout: int = 30,
+    ) -> Tuple[str, str, int]:
+        """Execute a command over SSH.
+
+        Args:
+            host: Hostname or IP address.
+            command: Command to execute.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+            timeout: Command execution timeout in seconds (default: 30).
+
+        Returns:
+            Tuple of (stdout, stderr, exit_code).
+
+        Raises:
+            SSHCommandError: If command execution fails.
+            SSHConnectionError: If connection is not established.
+        """
+        host_key = self._get_host_key(host, port, user)
+        conn = self._get_connection(host_key)
+
+        try:
+            logger.debug(f"Executing command on {host_key}: {command[:100]}")
+            result = await asyncio.wait_for(
+                conn.run(command, check=False, encoding=None), timeout
+            )
+
+            stdout_data = (result.stdout or b"").decode("utf-8", errors="replace")
+            stderr_data = (result.stderr or b"").decode("utf-8", errors="replace")
+            exit_code = result.exit_status if result.exit_status is not None else -1
+
+            if exit_code != 0:
+                logger.warning(
+                    f"Command on {host_key} exited with code {exit_code}: "
+                    f"{stderr_data[:200]}"
+                )
+            else:
+                logger.debug(f"Command on {host_key} completed successfully")
+
+            return stdout_data, stderr_data, exit_code
+
+        except Exception as e:
+            raise SSHCommandError(
+                f"Failed to execute command on {host_key}: {e}"
+            ) from e
+
+    async def execute_on_hosts(
+        self,
+        hosts: List[str],
+        command: str,
+        port: int = 22,
+        user: str = "root",
+        timeout: int = 30,
+    ) -> List[Tuple[str, str, int]]:
+        """Execute the same command on several hosts concurrently.
+
+        Args:
+            hosts: Hostnames or IP addresses, each already connected.
+            command: Command to execute.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+            timeout: Per-host execution timeout in seconds (default: 30).
+
+        Returns:
+            List of (stdout, stderr, exit_code) tuples, in the order of hosts.
+
+        Raises:
+            SSHCommandError: If command execution fails on any host.
+            SSHConnectionError: If any host is not connected.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.execute_command(host, command, port=port, user=user, timeout=timeout)
+                    for host in hosts
+                )
+            )
+        )
+
+    async def transfer_file(
+        self,
+        host: str,
+        local_path: str,
+        remote_path: str,
+        port: int = 22,
+        user: str = "root",
+    ) -> None:
+        """Transfer a file to remote host via SFTP.
+
+        Args:
+            host: Hostname or IP address.
+            local_path: Path to local file.
+            remote_path: Destination path on remote host.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+
+        Raises:
+            SSHTransferError: If file transfer fails.
+            SSHConnectionError: If connection is not established.
+            FileNotFoundError: If local file doesn't exist.
+        """
+        host_key = self._get_host_key(host, port, user)
+
+        local_file = Path(local_path).expanduser()
+        if not local_file.exists():
+            raise FileNotFoundError(f"Local file not found: {local_path}")
+
+        conn = self._get_connection(host_key)
+
+        try:
+            logger.debug(f"Transferring {local_path} to {host_key}:{remote_path}")
+            sftp = await self._get_sftp(host_key, conn)
+            remote_dir = os.path.dirname(remote_path)
+            if remote_dir:
+                await sftp.makedirs(remote_dir, exist_ok=True)
+            await sftp.put(str(local_file), remote_path)
+            logger.info(f"Successfully transferred {local_path} to {host_key}:{remote_path}")
+
+        except Exception as e:
+            # Don't reuse a session that may be left in a bad state
+            sftp = self._sftp_clients.pop(host_key, None)
+            if sftp is not None:
+                sftp.exit()
+            raise SSHTransferError(
+                f"Failed to transfer file to {host_key}: {e}"
+            ) from e
+
+    async def _get_sftp(
+        self, host_key: str, conn: "asyncssh.SSHClientConnection"
+    ) -> "asyncssh.SFTPClient":
+        """Return the cached SFTP client for a connection, starting it if needed.
+
+        Args:
+            host_key: Key returned by ``_get_host_key``.
+            conn: Pooled connection for the host.
+
+        Returns:
+            Open SFTP client.
+        """
+        sftp = self._sftp_clients.get(host_key)
+        if sftp is None:
+            async with self._host_lock(host_key):
+                sftp = self._sftp_clients.get(host_key)
+                if sftp is None:
+                    sftp = await conn.start_sftp_client()
+                    self._sftp_clients[host_key] = sftp
+        return sftp
+
+    async def close(
+        self, host: str, port: int = 22, user: str = "root"
+    ) -> None:
+        """Close SSH connection to a specific host.
+
+        Args:
+            host: Hostname or IP address.
+            port: SSH port number (default: 22).
+            user: Username for authentication (default: root).
+        """
+        host_key = self._get_host_key(host, port, user)
+
+        # The SFTP client is closed along with its connection
+        self._sftp_clients.pop(host_key, None)
+        conn = self._connections.pop(host_key, None)
+        if conn is not None:
+            conn.close()
+            await conn.wait_closed()
+            logger.debug(f"Closed connection to {host_key}")
+
+    async def close_all(self) -> None:
+        """Close all SSH connections in the pool concurrently."""
+        conns = list(self._connections.values())
+        self._connections.clear()
+        self._sftp_clients.clear()
+
+        for conn in conns:
+            conn.close()
+        await asyncio.gather(
+            *(conn.wait_closed() for conn in conns), return_exceptions=True
+        )
+        logger.info("Closed all SSH connections")
+
+    def get_active_connections(self) -> List[str]:
+        """Get list of active connection identifiers.
+
+        Returns:
+            List of host keys for active connections.
+        """
+        return list(self._connections.keys())
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - close all connections."""
+        await self.close_all()
+        return False
@@ -8,13 +8,46 @@ This module provides validation functions for:
 - Network connectivity
 """
 
-import re
+import errno
+import functools
+import math
 import os
+import stat
+import string
 from pathlib import Path
-from typing import Optional, List, Union
+from typing import Optional, List, Tuple, Union
 from urllib.parse import urlparse
 
 
+# Characters allowed in hostnames and test IDs; a set check is cheaper than a
+# regex match for these short ASCII strings
+_TESTID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_HOSTNAME_CHARS = _TESTID_CHARS | frozenset('.')
+
+# Characters allowed in a URL scheme (RFC 3986, as urlparse checks them)
+_SCHEME_CHARS = frozenset(string.ascii_letters + string.digits + '+-.')
+
+# Schemes accepted by validate_url when none are given
+_DEFAULT_SCHEMES = frozenset(('http', 'https'))
+
+# Types accepted by validate_positive_float (subclasses included)
+_NUMBER_TYPES = (int, float)
+
+# Seconds per duration unit
+_DURATION_MULT = {
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400,
+}
+
+# stat() errors that mean the path doesn't exist, as in Path.exists()
+_MISSING_ERRNOS = frozenset((errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP))
+
+# Windows error codes Path.exists() also treats as missing: drive not ready,
+# invalid name, and filename that can't be resolved
+_MISSING_WINERRORS = frozenset((21, 123, 1921))
+
 class ValidationError(Exception):
     """Raised when validation fails."""
     pass
@@ -34,8 +67,10 @@ def validate_positive_int(value: int, name: str, min_value: int = 1) -> int:
     Raises:
         ValidationError: If validation fails.
     """
-    if not isinstance(value, int):
-        raise ValidationError(f"{name} must be an integer, got {type(value).__name__}")
+    # Exact-type check first; isinstance only for bools and int subclasses
+    t = type(value)
+    if t is not int and not isinstance(value, int):
+        raise ValidationError(f"{name} must be an integer, got {t.__name__}")
     
     if value < min_value:
         raise ValidationError(f"{name} must be >= {min_value}, got {value}")
@@ -63,9 +98,10 @@ def validate_positive_float(
     Raises:
         ValidationError: If validation fails.
     """
-    if not isinstance(value, (int, float)):
+    t = type(value)
+    if t is not float and t is not int and not isinstance(value, _NUMBER_TYPES):
         raise ValidationError(
-            f"{name} must be a number, got {type(value).__name__}"
+            f"{name} must be a number, got {t.__name__}"
         )
     
     if value < min_value:
@@ -74,7 +110,7 @@ def validate_positive_float(
     if max_value is not None and value > max_value:
         raise ValidationError(f"{name} must be <= {max_value}, got {value}")
     
-    return float(value)
+    return value if t is float else float(value)
 
 
 def validate_percentage(value: Union[int, float], name: str) -> float:
@@ -93,10 +129,13 @@ def validate_percentage(value: Union[int, float], name: str) -> float:
     return validate_positive_float(value, name, min_value=0.0, max_value=100.0)
 
 
+@functools.lru_cache(maxsize=128)
 def parse_duration(duration: str) -> int:
     """Parse a duration string to seconds.
 
-    Supports formats like: 30s, 5m, 2h, 1d
+    Supports formats like: 30s, 5m, 2h, 1d. Results are memoized per input
+    string, since configs and test matrices repeat the same few durations;
+    invalid input is not cached and raises on every call.
     
     Args:
         duration: Duration string (e.g., "5m", "30s", "2h").
@@ -109,25 +148,18 @@ def parse_duration(duration: str) -> int:
     """
     duration = duration.strip().lower()
     
-    # Match pattern like "30s", "5m", "2h", "1d"
-    match = re.match(r'^(\d+)\s*([smhd])$', duration)
-    if not match:
+    # "<digits><unit>", optionally with whitespace before the unit; sliced
+    # by hand rather than matched with a regex. isdecimal() accepts exactly
+    # the digits int() does, so signs and underscores are still rejected
+    value = duration[:-1].rstrip()
+    multiplier = _DURATION_MULT.get(duration[-1:])
+    if multiplier is None or not value.isdecimal():
         raise ValidationError(
             f"Invalid duration format: {duration}. "
             "Expected format: <number><unit> where unit is s/m/h/d (e.g., 5m, 30s)"
         )
     
-    value, unit = match.groups()
-    value = int(value)
-    
-    multipliers = {
-        's': 1,
-        'm': 60,
-        'h': 3600,
-        'd': 86400,
-    }
-    
-    return value * multipliers[unit]
+    return int(value) * multiplier
 
 
 def format_duration(seconds: int) -> str:
@@ -139,26 +171,45 @@ def format_duration(seconds: int) -> str:
     Returns:
         Formatted duration string (e.g., "5m", "2h30m").
     """
-    if seconds < 60:
-        return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
-        if remaining_seconds:
-            return f"{minutes}m{remaining_seconds}s"
-        return f"{minutes}m"
-    elif seconds < 86400:
-        hours = seconds // 3600
-        remaining_minutes = (seconds % 3600) // 60
-        if remaining_minutes:
-            return f"{hours}h{remaining_minutes}m"
-        return f"{hours}h"
-    else:
-        days = seconds // 86400
-        remaining_hours = (seconds % 86400) // 3600
-        if remaining_hours:
-            return f"{days}d{remaining_hours}h"
-        return f"{days}d"
+    # Largest unit that fits, plus the next smaller unit when non-zero; one
+    # divmod and a single f-string per call
+    if seconds >= 86400:
+        days, hours = divmod(seconds, 86400)
+        hours //= 3600
+        return f"{days}d{hours}h" if hours else f"{days}d"
+    if seconds >= 3600:
+        hours, minutes = divmod(seconds, 3600)
+        minutes //= 60
+        return f"{hours}h{minutes}m" if minutes else f"{hours}h"
+    if seconds >= 60:
+        minutes, secs = divmod(seconds, 60)
+        return f"{minutes}m{secs}s" if secs else f"{minutes}m"
+    return f"{seconds}s"
+
+
+def _split_scheme_netloc(url: str) -> Optional[Tuple[str, str]]:
+    """Split ``<scheme>://<netloc>...`` without a full urlparse.
+
+    Only handles URLs where the result is certain to match urlparse: plain
+    printable ASCII, no leading space (urlparse strips it) and no brackets
+    (urlparse validates IPv6 literals).
+
+    Args:
+        url: URL to split.
+
+    Returns:
+        Lowercased scheme and netloc, or None if urlparse is needed.
+    """
+    if not (url.isascii() and url.isprintable()) or url[0] == ' ':
+        return None
+    if '[' in url or ']' in url:
+        return None
+    scheme, sep, rest = url.partition('://')
+    if not sep or not scheme[:1].isalpha() or not _SCHEME_CHARS.issuperset(scheme):
+        return None
+    for delim in '/?#':
+        rest = rest.partition(delim)[0]
+    return scheme.lower(), rest
 
 
 def validate_url(url: str, name: str, schemes: Optional[List[str]] = None) -> str:
@@ -179,22 +230,40 @@ def validate_url(url: str, name: str, schemes: Optional[List[str]] = None) -> st
         raise ValidationError(f"{name} cannot be empty")
     
     if schemes is None:
+        # Fast path: a plain http(s) URL whose host starts with an ASCII
+        # letter or digit always passes the checks below (brackets are left
+        # to urlparse, which rejects unbalanced IPv6 literals)
+        if url.startswith('https://'):
+            first = url[8:9]
+        elif url.startswith('http://'):
+            first = url[7:8]
+        else:
+            first = ''
+        if first.isascii() and first.isalnum() and '[' not in url and ']' not in url:
+            return url
         schemes = ['http', 'https']
+        allowed = _DEFAULT_SCHEMES
+    else:
+        allowed = frozenset(schemes)
     
-    try:
-        parsed = urlparse(url)
-    except Exception as e:
-        raise ValidationError(f"Invalid URL for {name}: {url} - {e}")
+    parts = _split_scheme_netloc(url)
+    if parts is None:
+        try:
+            parsed = urlparse(url)
+        except Exception as e:
+            raise ValidationError(f"Invalid URL for {name}: {url} - {e}")
+        parts = parsed.scheme, parsed.netloc
+    scheme, netloc = parts
     
-    if not parsed.scheme:
+    if not scheme:
         raise ValidationError(f"{name} must include a scheme (e.g., http://): {url}")
     
-    if parsed.scheme not in schemes:
+    if scheme not in allowed:
         raise ValidationError(
-            f"{name} scheme must be one of {schemes}, got {parsed.scheme}"
+            f"{name} scheme must be one of {schemes}, got {scheme}"
         )
     
-    if not parsed.netloc:
+    if not netloc:
         raise ValidationError(f"{name} must include a network location: {url}")
     
     return url
@@ -219,7 +288,8 @@ def validate_path(
         create_if_missing: If True, create directory if missing.
 
     Returns:
-        Validated Path object.
+        Validated Path object with ``~`` expanded. The path is only resolved
+        to a canonical absolute path when one of the checks is requested.
 
     Raises:
         ValidationError: If validation fails.
@@ -227,18 +297,36 @@ def validate_path(
     if not path:
         raise ValidationError(f"{name} cannot be empty")
     
-    path_obj = Path(path).expanduser().resolve()
+    path_obj = Path(path).expanduser()
+    
+    # resolve() costs an lstat per component; skip it when nothing is checked
+    if not (must_exist or must_be_file or must_be_dir or create_if_missing):
+        return path_obj
     
-    if must_exist and not path_obj.exists():
+    path_obj = path_obj.resolve()
+    
+    # One stat answers every check below; errors that Path.exists() treats
+    # as "missing" are treated the same way here
+    try:
+        mode = os.stat(path_obj).st_mode
+    except OSError as e:
+        if (
+            e.errno not in _MISSING_ERRNOS
+            and getattr(e, 'winerror', None) not in _MISSING_WINERRORS
+        ):
+            raise
+        mode = None
+    
+    if must_exist and mode is None:
         raise ValidationError(f"{name} does not exist: {path}")
     
-    if must_be_file and path_obj.exists() and not path_obj.is_file():
+    if must_be_file and mode is not None and not stat.S_ISREG(mode):
         raise ValidationError(f"{name} must be a file: {path}")
     
-    if must_be_dir and path_obj.exists() and not path_obj.is_dir():
+    if must_be_dir and mode is not None and not stat.S_ISDIR(mode):
         raise ValidationError(f"{name} must be a directory: {path}")
     
-    if create_if_missing and must_be_dir and not path_obj.exists():
+    if create_if_missing and must_be_dir and mode is None:
         try:
             path_obj.mkdir(parents=True, exist_ok=True)
         except Exception as e:
@@ -260,10 +348,11 @@ def validate_port(port: int, name: str) -> int:
     Raises:
         ValidationError: If port is invalid.
     """
-    if not isinstance(port, int):
-        raise ValidationError(f"{name} must be an integer, got {type(port).__name__}")
+    t = type(port)
+    if t is not int and not isinstance(port, int):
+        raise ValidationError(f"{name} must be an integer, got {t.__name__}")
     
-    if port < 1 or port > 65535:
+    if not 1 <= port <= 65535:
         raise ValidationError(f"{name} must be between 1 and 65535, got {port}")
     
     return port
@@ -289,7 +378,7 @@ def validate_hostname(hostname: str, name: str) -> str:
     
     # Simple validation - just check it's not empty and has reasonable characters
     # More complex validation would require DNS lookup
-    if not re.match(r'^[a-zA-Z0-9._-]+$', hostname):
+    if not hostname or not _HOSTNAME_CHARS.issuperset(hostname):
         raise ValidationError(
             f"Invalid {name}: {hostname}. "
             "Must contain only alphanumeric characters, dots, hyphens, and underscores"
@@ -331,7 +420,7 @@ def validate_test_id(test_id: str) -> str:
     test_id = test_id.strip()
     
     # Must be alphanumeric with hyphens and underscores
-    if not re.match(r'^[a-zA-Z0-9_-]+$', test_id):
+    if not test_id or not _TESTID_CHARS.issuperset(test_id):
         raise ValidationError(
             f"Invalid test ID: {test_id}. "
             "Must contain only alphanumeric characters, hyphens, and underscores"
@@ -355,7 +444,8 @@ def validate_ratio_sum(
     Raises:
         ValidationError: If ratios don't sum correctly.
     """
-    total = sum(ratios.values())
+    # Compensated summation, so float ratios don't drift towards the tolerance
+    total = math.fsum(ratios.values())
     
     if abs(total - expected_sum) > tolerance:
         ratio_str = ", ".join(f"{k}={v}" for k, v in ratios.items())
@@ -377,8 +467,9 @@ def validate_non_empty_string(value: str, name: str) -> str:
     Raises:
         ValidationError: If string is empty.
     """
-    if not isinstance(value, str):
-        raise ValidationError(f"{name} must be a string, got {type(value).__name__}")
+    t = type(value)
+    if t is not str and not isinstance(value, str):
+        raise ValidationError(f"{name} must be a string, got {t.__name__}")
     
     value = value.strip()
     
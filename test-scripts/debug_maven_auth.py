@@ -10,6 +10,42 @@ This script helps diagnose Maven authentication issues by testing:
 import requests
 import sys
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _make_session():
+    """Create a session carrying the headers common to every probe."""
+    session = requests.Session()
+    session.verify = False
+    session.headers.update({
+        'User-Agent': 'Apache-Maven/3.9.0 (Java 17.0.0)',
+        'Accept': 'application/xml',
+    })
+    return session
+
+
+def _probe(request, url, **kwargs):
+    """Issue one probe request.
+
+    Returns:
+        Tuple of (response, error); exactly one of them is None.
+    """
+    try:
+        return request(url, timeout=30, **kwargs), None
+    except Exception as e:
+        return None, e
+
+
+def _run_probes(probes):
+    """Issue probes one after another, in order.
+
+    Args:
+        probes: List of (request, url, kwargs) tuples.
+
+    Returns:
+        List of (response, error) tuples, one per probe.
+    """
+    return [_probe(request, url, **kwargs) for request, url, kwargs in probes]
 
 def test_maven_auth(base_url, username, password, group, artifact, version):
     """Test Maven authentication for metadata and download requests."""
@@ -28,88 +64,105 @@ def test_maven_auth(base_url, username, password, group, artifact, version):
     metadata_url = f"{base_url}/{group_path}/{artifact}/maven-metadata.xml"
     jar_url = f"{base_url}/{group_path}/{artifact}/{version}/{artifact}-{version}.jar"
     
-    # Prepare auth headers
+    # Prepare auth header; common headers live on the sessions
     credentials = b64encode(f'{username}:{password}'.encode()).decode()
-    auth_headers = {
-        'User-Agent': 'Apache-Maven/3.9.0 (Java 17.0.0)',
-        'Accept': 'application/xml',
-        'Authorization': f'Basic {credentials}'
-    }
-    
-    no_auth_headers = {
-        'User-Agent': 'Apache-Maven/3.9.0 (Java 17.0.0)',
-        'Accept': 'application/xml'
-    }
     
-    print(f"\nAuth Header: Authorization: Basic {credentials[:20]}...")
-    print("\n" + "="*70)
-    
-    # Test 1: Metadata request WITHOUT auth
-    print("\n1. METADATA REQUEST (WITHOUT AUTH)")
-    print(f"   URL: {metadata_url}")
-    try:
-        response = requests.get(metadata_url, headers=no_auth_headers, timeout=30, verify=False)
-        print(f"   Status: {response.status_code}")
-        if response.status_code != 200:
-            print(f"   Response: {response.text[:200]}")
-    except Exception as e:
-        print(f"   Error: {e}")
-    
-    # Test 2: Metadata request WITH auth
-    print("\n2. METADATA REQUEST (WITH AUTH)")
-    print(f"   URL: {metadata_url}")
-    try:
-        response = requests.get(metadata_url, headers=auth_headers, timeout=30, verify=False)
-        print(f"   Status: {response.status_code}")
-        if response.status_code == 200:
-            print(f"   ✓ Success - metadata fetched")
+    # Separate sessions for anonymous and authenticated probes so cookies set
+    # by authed responses can't leak into the anonymous ones
+    # Sessions are closed even if a probe or the report below raises
+    with _make_session() as anon_session, _make_session() as auth_session:
+        auth_session.headers['Authorization'] = f'Basic {credentials}'
+        
+        print(f"\nAuth Header: Authorization: Basic {credentials[:20]}...")
+        print("\n" + "="*70)
+        
+        # Each session's probes run in order on one worker so they reuse its
+        # connection; the two sessions run side by side. The streamed GET goes
+        # last since it holds its connection until the report closes it.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            anon_future = executor.submit(_run_probes, [
+                (anon_session.get, metadata_url, {}),
+                (anon_session.head, jar_url, {'allow_redirects': True}),
+            ])
+            auth_future = executor.submit(_run_probes, [
+                (auth_session.get, metadata_url, {}),
+                (auth_session.head, jar_url, {'allow_redirects': True}),
+                (auth_session.get, jar_url, {'stream': True}),
+            ])
+            anon_metadata, anon_head = anon_future.result()
+            auth_metadata, auth_head, auth_get = auth_future.result()
+        results = [anon_metadata, auth_metadata, anon_head, auth_head, auth_get]
+        
+        # Test 1: Metadata request WITHOUT auth
+        print("\n1. METADATA REQUEST (WITHOUT AUTH)")
+        print(f"   URL: {metadata_url}")
+        response, error = results[0]
+        if error:
+            print(f"   Error: {error}")
         else:
-            print(f"   ✗ Failed - Response: {response.text[:200]}")
-    except Exception as e:
-        print(f"   Error: {e}")
-    
-    # Test 3: JAR download WITHOUT auth (HEAD request)
-    print("\n3. JAR DOWNLOAD REQUEST (WITHOUT AUTH - HEAD)")
-    print(f"   URL: {jar_url}")
-    try:
-        response = requests.head(jar_url, headers=no_auth_headers, timeout=30, allow_redirects=True, verify=False)
-        print(f"   Status: {response.status_code}")
-        if response.status_code != 200:
-            print(f"   Response: {response.text[:200] if response.text else 'No content'}")
-    except Exception as e:
-        print(f"   Error: {e}")
-    
-    # Test 4: JAR download WITH auth (HEAD request)
-    print("\n4. JAR DOWNLOAD REQUEST (WITH AUTH - HEAD)")
-    print(f"   URL: {jar_url}")
-    try:
-        response = requests.head(jar_url, headers=auth_headers, timeout=30, allow_redirects=True, verify=False)
-        print(f"   Status: {response.status_code}")
-        if response.status_code == 200:
-            print(f"   ✓ Success - JAR exists")
-            print(f"   Content-Length: {response.headers.get('Content-Length', 'unknown')}")
+            print(f"   Status: {response.status_code}")
+            if response.status_code != 200:
+                print(f"   Response: {response.text[:200]}")
+        
+        # Test 2: Metadata request WITH auth
+        print("\n2. METADATA REQUEST (WITH AUTH)")
+        print(f"   URL: {metadata_url}")
+        response, error = results[1]
+        if error:
+            print(f"   Error: {error}")
         else:
-            print(f"   ✗ Failed")
-            print(f"   Headers: {dict(response.headers)}")
-    except Exception as e:
-        print(f"   Error: {e}")
-    
-    # Test 5: JAR download WITH auth (GET request - first 100 bytes)
-    print("\n5. JAR DOWNLOAD REQUEST (WITH AUTH - GET)")
-    print(f"   URL: {jar_url}")
-    try:
-        response = requests.get(jar_url, headers=auth_headers, timeout=30, stream=True, verify=False)
-        print(f"   Status: {response.status_code}")
-        if response.status_code == 200:
-            # Read first 100 bytes
-            chunk = next(response.iter_content(100), None)
-            if chunk:
-                print(f"   ✓ Success - downloaded {len(chunk)} bytes")
-            response.close()
+            print(f"   Status: {response.status_code}")
+            if response.status_code == 200:
+                print(f"   ✓ Success - metadata fetched")
+            else:
+                print(f"   ✗ Failed - Response: {response.text[:200]}")
+        
+        # Test 3: JAR download WITHOUT auth (HEAD request)
+        print("\n3. JAR DOWNLOAD REQUEST (WITHOUT AUTH - HEAD)")
+        print(f"   URL: {jar_url}")
+        response, error = results[2]
+        if error:
+            print(f"   Error: {error}")
         else:
-            print(f"   ✗ Failed - Response: {response.text[:200]}")
-    except Exception as e:
-        print(f"   Error: {e}")
+            print(f"   Status: {response.status_code}")
+            if response.status_code != 200:
+                print(f"   Response: {response.text[:200] if response.text else 'No content'}")
+        
+        # Test 4: JAR download WITH auth (HEAD request)
+        print("\n4. JAR DOWNLOAD REQUEST (WITH AUTH - HEAD)")
+        print(f"   URL: {jar_url}")
+        response, error = results[3]
+        if error:
+            print(f"   Error: {error}")
+        else:
+            print(f"   Status: {response.status_code}")
+            if response.status_code == 200:
+                print(f"   ✓ Success - JAR exists")
+                print(f"   Content-Length: {response.headers.get('Content-Length', 'unknown')}")
+            else:
+                print(f"   ✗ Failed")
+                print(f"   Headers: {dict(response.headers)}")
+        
+        # Test 5: JAR download WITH auth (GET request - first 100 bytes)
+        print("\n5. JAR DOWNLOAD REQUEST (WITH AUTH - GET)")
+        print(f"   URL: {jar_url}")
+        response, error = results[4]
+        if error:
+            print(f"   Error: {error}")
+        else:
+            try:
+                print(f"   Status: {response.status_code}")
+                if response.status_code == 200:
+                    # Read first 100 bytes
+                    chunk = next(response.iter_content(100), None)
+                    if chunk:
+                        print(f"   ✓ Success - downloaded {len(chunk)} bytes")
+                else:
+                    print(f"   ✗ Failed - Response: {response.text[:200]}")
+            except Exception as e:
+                print(f"   Error: {e}")
+            finally:
+                response.close()
     
     print("\n" + "="*70)
     print("DIAGNOSIS COMPLETE")
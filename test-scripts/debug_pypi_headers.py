@@ -1,12 +1,127 @@
 #!/usr/bin/env python3
 """Debug script to compare PyPI request headers between curl and Python requests."""
 
-import requests
-import base64
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from pathlib import Path
 from urllib.parse import urlparse
 
-def test_pypi_request(url, username, password, verbose=True):
+
+# Header variants to compare, matching pip and curl as closely as possible
+_HEADER_VARIANTS = {
+    'standard_pip': {
+        'User-Agent': 'pip/23.0 CPython/3.11.0',
+        'Accept': 'application/json'
+    },
+    'curl_like': {
+        'User-Agent': 'curl/8.13.0',
+        'Accept': '*/*'
+    },
+    'minimal': {
+        'Accept': '*/*'
+    }
+}
+
+
+# Probe results saved by --cache, and how long they stay valid (seconds)
+_CACHE_FILE = Path.home() / '.cache' / 'socket-load-test' / 'pypi-debug.json'
+_CACHE_TTL = 60
+
+# Response headers that can carry credentials or session state; never cached
+_UNCACHED_HEADERS = {
+    'authorization',
+    'cookie',
+    'proxy-authenticate',
+    'proxy-authorization',
+    'set-cookie',
+    'www-authenticate',
+}
+
+
+def _preview(response, limit):
+    """Decode at most ``limit`` bytes of a streamed body, then drain the rest.
+
+    The remainder is read as raw bytes without decoding; reading to the end
+    lets urllib3 return the connection to the session's pool.
+    """
+    chunk = next(response.iter_content(chunk_size=limit), b'')
+    for _ in response.raw.stream(64 * 1024, decode_content=False):
+        pass
+    return chunk.decode(response.encoding or 'utf-8', errors='replace')
+
+
+def _probe(session, url, headers, timeout):
+    """Send one probe and capture what gets printed about its response."""
+    response = session.get(
+        url,
+        headers=headers,
+        timeout=timeout,
+        stream=True,  # only a short preview of the body is decoded
+    )
+    try:
+        return {
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'preview': _preview(response, 500),
+        }
+    finally:
+        response.close()
+
+
+def _cache_key(salt, url, variant, username, password):
+    """Key a cached probe result; changing the credentials invalidates it.
+
+    The key is an HMAC under the cache file's random salt, so the stored
+    keys can't be used to test password guesses without that file.
+    """
+    message = f"{url}|{variant}|{username}|{password}".encode()
+    return hmac.new(bytes.fromhex(salt), message, hashlib.sha256).hexdigest()
+
+
+def _load_cache():
+    """Load the cache salt and unexpired cached probe results.
+
+    Returns:
+        (salt, entries); a new salt and no entries if there is no usable cache.
+    """
+    try:
+        data = json.loads(_CACHE_FILE.read_text())
+        salt, entries = data['salt'], data['entries']
+        bytes.fromhex(salt)
+    except (OSError, ValueError, KeyError, TypeError):
+        return secrets.token_hex(16), {}
+    now = time.time()
+    return salt, {
+        key: entry for key, entry in entries.items()
+        if now - entry.get('stored_at', 0) < _CACHE_TTL
+    }
+
+
+def _save_cache(salt, entries):
+    """Write probe results to an owner-only cache file, ignoring write failures."""
+    try:
+        _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            # The mode above only applies to newly created files
+            os.chmod(_CACHE_FILE, 0o600)
+            f.write(json.dumps({'salt': salt, 'entries': entries}))
+    except OSError as e:
+        print(f"Warning: could not write cache {_CACHE_FILE}: {e}")
+
+
+def test_pypi_request(
+    url, username, password, verbose=True, use_cache=False, timeout=30, verify=True
+):
     """
     Test PyPI metadata request and show all request/response headers.
     
@@ -15,152 +130,221 @@ def test_pypi_request(url, username, password, verbose=True):
         username: Username for basic auth
         password: Password for basic auth
         verbose: Print detailed information
+        use_cache: Reuse header-variant results from the last _CACHE_TTL
+            seconds instead of sending those probes again
+        timeout: Per-request timeout in seconds
+        verify: Verify TLS certificates (disable for self-signed certs)
     """
+    # Imported here so the usage message doesn't wait on requests/urllib3
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     
-    # Prepare headers matching curl as closely as possible
-    headers_options = {
-        'standard_pip': {
-            'User-Agent': 'pip/23.0 CPython/3.11.0',
-            'Accept': 'application/json'
-        },
-        'curl_like': {
-            'User-Agent': 'curl/8.13.0',
-            'Accept': '*/*'
-        },
-        'minimal': {
-            'Accept': '*/*'
-        }
-    }
+    # Each block of output is written with a single stdout write
+    sys.stdout.write("\n".join([
+        "=" * 80,
+        f"Testing URL: {url}",
+        f"Username: {username}",
+        f"Password: {'*' * len(password)}",
+        "=" * 80,
+        "",
+        "",
+    ]))
+    
+    # Parse URL to get host; explicitly set the Host header without the port
+    # (some servers require this)
+    host_only = urlparse(url).hostname
     
-    # Encode credentials
-    credentials = base64.b64encode(f'{username}:{password}'.encode()).decode()
-    auth_header = f'Basic {credentials}'
+    # Add the host to each variant up front
+    prepared_headers = {
+        name: {**base, 'Host': host_only}
+        for name, base in _HEADER_VARIANTS.items()
+    }
     
-    print("=" * 80)
-    print(f"Testing URL: {url}")
-    print(f"Username: {username}")
-    print(f"Password: {'*' * len(password)}")
-    print("=" * 80)
-    print()
+    # One session so every probe reuses the same TCP/TLS connection pool.
+    # The probes run concurrently, so instead of clearing cookies between
+    # them the session never stores any: one header variant can't
+    # authenticate another through a session cookie.
+    session = requests.Session()
+    # Report the first response of every probe; never retry
+    adapter = HTTPAdapter(
+        max_retries=Retry(total=0, connect=0, read=0, redirect=0, status=0, raise_on_status=False),
+        pool_connections=1,
+        pool_maxsize=4,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    # requests builds the Basic Authorization header for every probe
+    session.auth = (username, password)
+    session.verify = verify
     
-    # Parse URL to get host
-    parsed = urlparse(url)
+    salt, cache = _load_cache() if use_cache else (secrets.token_hex(16), {})
+    keys = {
+        name: _cache_key(salt, url, name, username, password)
+        for name in prepared_headers
+    }
     
-    for header_name, base_headers in headers_options.items():
-        print(f"\n{'=' * 80}")
-        print(f"Test: {header_name.upper()} headers")
-        print(f"{'=' * 80}")
+    try:
+        # The variants are independent; send all uncached ones at once and
+        # report the results in order
+        pending = [name for name in prepared_headers if keys[name] not in cache]
+        futures = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = {
+                    name: executor.submit(_probe, session, url, prepared_headers[name], timeout)
+                    for name in pending
+                }
         
-        # Add authorization
-        headers = base_headers.copy()
-        headers['Authorization'] = auth_header
+        for header_name, headers in prepared_headers.items():
+            cached = cache.get(keys[header_name])
+            
+            lines = [
+                f"\n{'=' * 80}",
+                f"Test: {header_name.upper()} headers{' [cached]' if cached else ''}",
+                f"{'=' * 80}",
+                "\nRequest Headers:",
+            ]
+            for key, value in headers.items():
+                lines.append(f"  {key}: {value}")
+            lines.append("  Authorization: Basic <redacted>")
+            
+            try:
+                if cached:
+                    result = cached
+                else:
+                    lines.append(f"\nSent GET request to {url}")
+                    result = futures[header_name].result()
+                    if use_cache and 'no-store' not in {
+                        k.lower(): v for k, v in result['headers'].items()
+                    }.get('cache-control', ''):
+                        cache[keys[header_name]] = {
+                            **result,
+                            'headers': {
+                                k: v for k, v in result['headers'].items()
+                                if k.lower() not in _UNCACHED_HEADERS
+                            },
+                            'stored_at': time.time(),
+                        }
+                
+                lines.append(f"\nResponse Status: {result['status_code']}")
+                lines.append(f"Response Reason: {result['reason']}")
+                
+                lines.append("\nResponse Headers:")
+                for key, value in result['headers'].items():
+                    lines.append(f"  {key}: {value}")
+                
+                if result['status_code'] == 401:
+                    lines.append("\n⚠️  401 UNAUTHORIZED - Authentication failed")
+                    lines.append("Response body:")
+                    lines.append(result['preview'])
+                elif result['status_code'] == 404:
+                    lines.append("\n✓ Authentication successful (404 means package not found, auth worked)")
+                elif result['status_code'] == 200:
+                    lines.append("\n✓ SUCCESS")
+                    lines.append("Response preview:")
+                    lines.append(result['preview'][:200])
+                else:
+                    lines.append(f"\nResponse body preview:")
+                    lines.append(result['preview'])
+                    
+            except requests.exceptions.SSLError as e:
+                lines.append(f"\n❌ SSL Error: {e}")
+                lines.append("Try running with --no-verify or fix SSL certificates")
+            except Exception as e:
+                lines.append(f"\n❌ Error: {type(e).__name__}: {e}")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
+        
+        if use_cache:
+            _save_cache(salt, cache)
         
-        # Explicitly set Host header (some servers require this)
-        headers['Host'] = parsed.netloc.split(':')[0]  # Without port
+        # Additional debug: Show what requests library actually sends
+        sys.stdout.write("\n".join([
+            f"\n\n{'=' * 80}",
+            "DEBUGGING: Actual request sent by requests library",
+            "=" * 80,
+            "",
+        ]))
         
-        print("\nRequest Headers:")
-        for key, value in headers.items():
-            if key == 'Authorization':
-                print(f"  {key}: Basic <redacted>")
-            else:
-                print(f"  {key}: {value}")
+        # Use a hook to capture the actual request
+        def print_request(r, *args, **kwargs):
+            lines = ["\nActual request headers sent:"]
+            for key, value in r.request.headers.items():
+                if key.lower() == 'authorization':
+                    lines.append(f"  {key}: Basic <redacted>")
+                else:
+                    lines.append(f"  {key}: {value}")
+            sys.stdout.write("\n".join(lines) + "\n")
+        
+        headers = {
+            'User-Agent': 'pip/23.0 CPython/3.11.0',
+            'Accept': 'application/json',
+        }
         
         try:
-            # Make request with explicit headers
-            print(f"\nSending GET request to {url}")
-            response = requests.get(
+            response = session.get(
                 url, 
                 headers=headers,
-                timeout=30,
-                verify=True  # Change to False if using self-signed certs
+                hooks={'response': print_request},
+                timeout=timeout
             )
-            
-            print(f"\nResponse Status: {response.status_code}")
-            print(f"Response Reason: {response.reason}")
-            
-            print("\nResponse Headers:")
-            for key, value in response.headers.items():
-                print(f"  {key}: {value}")
-            
-            if response.status_code == 401:
-                print("\n⚠️  401 UNAUTHORIZED - Authentication failed")
-                print("Response body:")
-                print(response.text[:500])
-            elif response.status_code == 404:
-                print("\n✓ Authentication successful (404 means package not found, auth worked)")
-            elif response.status_code == 200:
-                print("\n✓ SUCCESS")
-                print("Response preview:")
-                print(response.text[:200])
-            else:
-                print(f"\nResponse body preview:")
-                print(response.text[:500])
-                
-        except requests.exceptions.SSLError as e:
-            print(f"\n❌ SSL Error: {e}")
-            print("Try running with verify=False or fix SSL certificates")
+            print(f"\nFinal Status: {response.status_code}")
         except Exception as e:
-            print(f"\n❌ Error: {type(e).__name__}: {e}")
-    
-    # Additional debug: Show what requests library actually sends
-    print(f"\n\n{'=' * 80}")
-    print("DEBUGGING: Actual request sent by requests library")
-    print(f"{'=' * 80}")
-    
-    # Use a hook to capture the actual request
-    def print_request(r, *args, **kwargs):
-        print("\nActual request headers sent:")
-        for key, value in r.headers.items():
-            if key.lower() == 'authorization':
-                print(f"  {key}: Basic <redacted>")
-            else:
-                print(f"  {key}: {value}")
-    
-    headers = {
-        'User-Agent': 'pip/23.0 CPython/3.11.0',
-        'Accept': 'application/json',
-        'Authorization': auth_header
-    }
-    
-    try:
-        response = requests.get(
-            url, 
-            headers=headers,
-            hooks={'response': print_request},
-            timeout=30
-        )
-        print(f"\nFinal Status: {response.status_code}")
-    except Exception as e:
-        print(f"Error: {e}")
+            print(f"Error: {e}")
+    finally:
+        session.close()
 
 
 def main():
-    if len(sys.argv) < 4:
-        print("Usage: python debug_pypi_headers.py <url> <username> <password>")
-        print()
-        print("Example (using Simple API - PEP 503):")
-        print("  python debug_pypi_headers.py \\")
-        print('    "https://artifactory.example.com/artifactory/api/pypi/pypi-remote/simple/joblib/" \\')
-        print('    "myuser" \\')
-        print('    "your-password"')
-        sys.exit(1)
-    
-    url = sys.argv[1]
-    username = sys.argv[2]
-    password = sys.argv[3]
+    parser = argparse.ArgumentParser(
+        description="Compare PyPI request headers between curl and Python requests.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "Example (using Simple API - PEP 503):\n"
+            "  python debug_pypi_headers.py \\\n"
+            '    "https://artifactory.example.com/artifactory/api/pypi/pypi-remote/simple/joblib/" \\\n'
+            '    "myuser" \\\n'
+            '    "your-password"'
+        ),
+    )
+    parser.add_argument('url', help="Full URL to test")
+    parser.add_argument('username', help="Username for basic auth")
+    parser.add_argument('password', help="Password for basic auth")
+    parser.add_argument('--timeout', type=int, default=30, help="Request timeout in seconds")
+    parser.add_argument(
+        '--no-verify', action='store_true', help="Skip TLS certificate verification"
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f"Reuse probe results from the last {_CACHE_TTL}s",
+    )
+    args = parser.parse_args()
     
-    test_pypi_request(url, username, password)
+    test_pypi_request(
+        args.url,
+        args.username,
+        args.password,
+        use_cache=args.cache,
+        timeout=args.timeout,
+        verify=not args.no_verify,
+    )
     
-    print("\n" + "=" * 80)
-    print("COMPARISON WITH CURL")
-    print("=" * 80)
-    print("\nYour working curl command uses:")
-    print("  User-Agent: curl/8.13.0")
-    print("  Accept: */*")
-    print("  Authorization: Basic <credentials>")
-    print()
-    print("If one of the tests above works but others don't,")
-    print("update the headers in metadata_fetcher.py to match the working ones.")
+    sys.stdout.write("\n".join([
+        "\n" + "=" * 80,
+        "COMPARISON WITH CURL",
+        "=" * 80,
+        "\nYour working curl command uses:",
+        "  User-Agent: curl/8.13.0",
+        "  Accept: */*",
+        "  Authorization: Basic <credentials>",
+        "",
+        "If one of the tests above works but others don't,",
+        "update the headers in metadata_fetcher.py to match the working ones.",
+        "",
+    ]))
 
 
 if __name__ == '__main__':
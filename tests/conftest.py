@@ -1,7 +1,39 @@
 """Test configuration for socket-load-test."""
 
+import logging
+import sys
+
 import pytest
 
+from socket_load_test.utils.logging import set_log_level, setup_logging, stop_logging
+
+# Skip writing .pyc files for modules first imported by the test run
+sys.dont_write_bytecode = True
+
+
+@pytest.fixture
+def make_record():
+    """Provide a factory for bare log records."""
+    def _make_record(msg, args=(), level=logging.INFO):
+        return logging.LogRecord("test", level, "", 0, msg, args, None)
+    return _make_record
+
+
+@pytest.fixture(scope="session")
+def log_base():
+    """Configure logging once for tests that only change log levels."""
+    logger = setup_logging(level="INFO")
+    yield logger
+    stop_logging()
+
+
+@pytest.fixture
+def info_logger(log_base):
+    """Provide the root logger at INFO, restoring INFO afterwards."""
+    set_log_level("INFO")
+    yield log_base
+    set_log_level("INFO")
+
 
 @pytest.fixture
 def sample_config():
@@ -68,10 +68,16 @@ class ConcreteInfrastructure(BaseInfrastructure):
         self._files_transferred.clear()
 
 
-def test_concrete_implementation():
+@pytest.fixture
+def infra():
+    """Provide a ConcreteInfrastructure, cleaned up after the test."""
+    instance = ConcreteInfrastructure()
+    yield instance
+    instance.cleanup()
+
+
+def test_concrete_implementation(infra):
     """Test that concrete implementation works correctly."""
-    infra = ConcreteInfrastructure()
-    
     # Test connect
     assert not infra.validate_connectivity()
     infra.connect()
@@ -110,10 +116,8 @@ def test_concrete_implementation():
     assert len(infra._files_transferred) == 0
 
 
-def test_methods_require_connection():
+def test_methods_require_connection(infra):
     """Test that methods require connection."""
-    infra = ConcreteInfrastructure()
-    
     with pytest.raises(ConnectionError):
         infra.execute_command("gen-1", "test")
     
@@ -124,9 +128,8 @@ def test_methods_require_connection():
         infra.setup_monitoring("gen-1")
 
 
-def test_execute_command_background():
+def test_execute_command_background(infra):
     """Test background command execution."""
-    infra = ConcreteInfrastructure()
     infra.connect()
     
     result = infra.execute_command("gen-1", "long-running-task", bg=True)
@@ -134,9 +137,8 @@ def test_execute_command_background():
     assert ("gen-1", "long-running-task", True) in infra._commands_executed
 
 
-def test_multiple_file_transfers():
+def test_multiple_file_transfers(infra):
     """Test multiple file transfers."""
-    infra = ConcreteInfrastructure()
     infra.connect()
     
     files = [
@@ -1,109 +1,65 @@
 """Tests for logging utilities."""
 
 import logging
-import tempfile
-from pathlib import Path
+import logging.handlers
 
 import pytest
 
 from socket_load_test.utils.logging import (
+    BufferedFileHandler,
     SensitiveDataFilter,
+    SensitiveFormatter,
     ContextLogger,
     setup_logging,
+    stop_logging,
     get_logger,
     set_log_level,
     enable_debug_logging,
     disable_debug_logging,
+    mask_auth_header,
 )
 
 
-class TestSensitiveDataFilter:
-    """Tests for SensitiveDataFilter."""
+def _emitting_handlers(logger):
+    """Return the handlers that actually write records for a logger."""
+    handlers = []
+    for handler in logger.handlers:
+        listener = getattr(handler, "listener", None)
+        handlers.extend(listener.handlers if listener else [handler])
+    return handlers
 
-    def test_filter_password(self):
-        """Test filtering password from log message."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg='Connecting with password="secret123"',
-            args=(),
-            exc_info=None,
-        )
-        
-        log_filter.filter(record)
-        assert "secret123" not in record.msg
-        assert "password=" in record.msg
-        assert "***" in record.msg
 
-    def test_filter_key(self):
-        """Test filtering key from log message."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg='Using key: mySecretKey123',
-            args=(),
-            exc_info=None,
-        )
-        
-        log_filter.filter(record)
-        assert "mySecretKey123" not in record.msg
-        assert "key:" in record.msg
-        assert "***" in record.msg
+@pytest.fixture(scope="module")
+def log_filter():
+    """Provide one filter for the module; it keeps no per-record state."""
+    return SensitiveDataFilter()
 
-    def test_filter_token(self):
-        """Test filtering token from log message."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg='Auth token=ghp_1234567890abcdef',
-            args=(),
-            exc_info=None,
-        )
-        
-        log_filter.filter(record)
-        assert "ghp_1234567890abcdef" not in record.msg
-        assert "token=" in record.msg
-        assert "***" in record.msg
 
-    def test_filter_api_key(self):
-        """Test filtering API key from log message."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg='Config: {"api_key": "sk_live_1234567890"}',
-            args=(),
-            exc_info=None,
-        )
+class TestSensitiveDataFilter:
+    """Tests for SensitiveDataFilter."""
+
+    @pytest.mark.parametrize(
+        "msg,secret,kept",
+        [
+            ('Connecting with password="secret123"', "secret123", "password="),
+            ("Using key: mySecretKey123", "mySecretKey123", "key:"),
+            ("Auth token=ghp_1234567890abcdef", "ghp_1234567890abcdef", "token="),
+            ('Config: {"api_key": "sk_live_1234567890"}', "sk_live_1234567890", "api_key"),
+        ],
+        ids=["password", "key", "token", "api_key"],
+    )
+    def test_filter_single_value(self, log_filter, make_record, msg, secret, kept):
+        """Test filtering a single sensitive value from a log message."""
+        record = make_record(msg)
         
         log_filter.filter(record)
-        assert "sk_live_1234567890" not in record.msg
-        assert "api_key" in record.msg
+        assert secret not in record.msg
+        assert kept in record.msg
         assert "***" in record.msg
 
-    def test_filter_multiple_sensitive_values(self):
+    def test_filter_multiple_sensitive_values(self, log_filter, make_record):
         """Test filtering multiple sensitive values."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg='Config: password=pass123, token=tok456, key=key789',
-            args=(),
-            exc_info=None,
-        )
+        record = make_record('Config: password=pass123, token=tok456, key=key789')
         
         log_filter.filter(record)
         assert "pass123" not in record.msg
@@ -111,41 +67,57 @@ class TestSensitiveDataFilter:
         assert "key789" not in record.msg
         assert record.msg.count("***") == 3
 
-    def test_filter_dict_args(self):
-        """Test filtering sensitive data from dict args."""
-        log_filter = SensitiveDataFilter()
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg="Config: %s",
-            args=({"password": "secret"},),
-            exc_info=None,
+    def test_filter_auth_header_and_cli_args(self, log_filter, make_record):
+        """Test filtering Authorization headers and command line secrets."""
+        record = make_record(
+            'Authorization: Bearer abc.def.ghi; running npm --npm-token tok123 install'
         )
         
+        log_filter.filter(record)
+        assert "abc.def.ghi" not in record.msg
+        assert "tok123" not in record.msg
+        assert "Authorization: Bearer ***" in record.msg
+        assert "--npm-token ***" in record.msg
+
+    def test_filter_dict_args(self, log_filter, make_record):
+        """Test filtering sensitive data from dict args."""
+        record = make_record("Config: %s", ({"password": "secret"},))
+        
         log_filter.filter(record)
         # The args should be modified - dict becomes tuple of modified values
         assert isinstance(record.args, (tuple, dict))
 
-    def test_no_sensitive_data(self):
+    def test_non_string_args_untouched(self, log_filter, make_record):
+        """Test that non-string args are passed through unchanged."""
+        args = (1000, 2.5, None, "token=abc123")
+        record = make_record("rps=%d ratio=%s extra=%s %s", args)
+        
+        log_filter.filter(record)
+        assert record.args[:3] == (1000, 2.5, None)
+        assert type(record.args[0]) is int
+        assert record.args[3] == "token=***"
+
+    def test_no_sensitive_data(self, log_filter, make_record):
         """Test message without sensitive data remains unchanged."""
-        log_filter = SensitiveDataFilter()
         original_msg = "This is a normal log message"
-        record = logging.LogRecord(
-            name="test",
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg=original_msg,
-            args=(),
-            exc_info=None,
-        )
+        record = make_record(original_msg)
         
         log_filter.filter(record)
         assert record.msg == original_msg
 
 
+class TestSensitiveFormatter:
+    """Tests for SensitiveFormatter."""
+
+    def test_masks_interpolated_args(self, make_record):
+        """Test that sensitive values passed as args are masked."""
+        formatter = SensitiveFormatter(fmt="%(message)s")
+        record = make_record("Connecting with %s to %s", ("password=secret123", "example.com"))
+        
+        output = formatter.format(record)
+        assert output == "Connecting with password=*** to example.com"
+
+
 class TestContextLogger:
     """Tests for ContextLogger."""
 
@@ -160,6 +132,29 @@ class TestContextLogger:
         assert "node=node-1" in msg
         assert "Test message" in msg
 
+    def test_set_context_updates_prefix(self):
+        """Test that replacing the context changes the message prefix."""
+        logger = ContextLogger(logging.getLogger("test_set_context"), {"node": "node-1"})
+        logger.set_context({"node": "node-2"})
+        
+        msg, kwargs = logger.process("Test message", {})
+        assert msg == "[node=node-2] Test message"
+
+    def test_non_string_message(self):
+        """Test that non-string messages such as exceptions are prefixed."""
+        logger = ContextLogger(logging.getLogger("test_non_string"), {"a": 1})
+        
+        msg, kwargs = logger.process(ValueError("boom"), {})
+        assert msg == "[a=1] boom"
+
+    def test_logs_exception_object(self, caplog):
+        """Test logging an exception object through a ContextLogger."""
+        logger = ContextLogger(logging.getLogger("test_exc_object"), {"a": 1})
+        
+        with caplog.at_level(logging.ERROR, logger="test_exc_object"):
+            logger.error(ValueError("boom"))
+        assert caplog.records[-1].getMessage() == "[a=1] boom"
+
     def test_no_context(self):
         """Test logger with no context."""
         base_logger = logging.getLogger("test_no_context")
@@ -191,28 +186,44 @@ class TestSetupLogging:
         logger = setup_logging(verbose=True)
         assert logger.level == logging.DEBUG
 
-    def test_setup_with_file(self):
+    def test_setup_with_file(self, tmp_path):
         """Test setup with log file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log_file = Path(tmpdir) / "test.log"
-            logger = setup_logging(log_file=str(log_file))
-            
-            # Should have file handler
-            file_handlers = [
-                h for h in logger.handlers
-                if isinstance(h, logging.FileHandler)
-            ]
-            assert len(file_handlers) > 0
-            assert log_file.exists()
-
-    def test_setup_creates_log_directory(self):
+        log_file = tmp_path / "test.log"
+        logger = setup_logging(log_file=str(log_file))
+        
+        # Should have file handler
+        file_handlers = [
+            h for h in _emitting_handlers(logger)
+            if isinstance(h, logging.FileHandler)
+        ]
+        assert len(file_handlers) > 0
+        assert log_file.exists()
+        stop_logging()
+
+    def test_setup_uses_queue_handler(self, tmp_path):
+        """Test that records are written through a background listener."""
+        log_file = tmp_path / "test.log"
+        logger = setup_logging(log_file=str(log_file), log_to_console=False)
+        
+        assert all(
+            isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers
+        )
+        
+        logging.getLogger("test_queue").info("queued message token=abc123")
+        stop_logging()
+        
+        content = log_file.read_text()
+        assert "queued message token=***" in content
+        assert "abc123" not in content
+
+    def test_setup_creates_log_directory(self, tmp_path):
         """Test that setup creates log directory if needed."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log_file = Path(tmpdir) / "logs" / "subdir" / "test.log"
-            setup_logging(log_file=str(log_file))
-            
-            assert log_file.exists()
-            assert log_file.parent.exists()
+        log_file = tmp_path / "logs" / "subdir" / "test.log"
+        setup_logging(log_file=str(log_file))
+        
+        assert log_file.exists()
+        assert log_file.parent.exists()
+        stop_logging()
 
     def test_setup_no_console(self):
         """Test setup without console logging."""
@@ -220,23 +231,50 @@ class TestSetupLogging:
         
         # Should have no StreamHandler
         stream_handlers = [
-            h for h in logger.handlers
+            h for h in _emitting_handlers(logger)
             if isinstance(h, logging.StreamHandler)
             and not isinstance(h, logging.FileHandler)
         ]
         assert len(stream_handlers) == 0
 
     def test_sensitive_filter_applied(self):
-        """Test that sensitive data filter is applied to handlers."""
+        """Test that sensitive data formatter is applied to handlers."""
         logger = setup_logging()
         
-        for handler in logger.handlers:
-            # Check if filter is applied
-            filters = [
-                f for f in handler.filters
-                if isinstance(f, SensitiveDataFilter)
-            ]
-            assert len(filters) > 0
+        for handler in _emitting_handlers(logger):
+            assert isinstance(handler.formatter, SensitiveFormatter)
+
+    def test_sensitive_filter_disabled(self):
+        """Test that sensitive data masking can be turned off."""
+        logger = setup_logging(filter_sensitive=False)
+        
+        for handler in _emitting_handlers(logger):
+            assert not isinstance(handler.formatter, SensitiveFormatter)
+
+
+class TestBufferedFileHandler:
+    """Tests for BufferedFileHandler."""
+
+    def test_buffers_until_close(self, make_record, tmp_path):
+        """Test that low-severity records are written on close."""
+        log_file = tmp_path / "test.log"
+        handler = BufferedFileHandler(str(log_file))
+        
+        handler.handle(make_record("buffered line", level=logging.INFO))
+        assert log_file.read_text() == ""
+        
+        handler.close()
+        assert log_file.read_text() == "buffered line\n"
+
+    def test_flushes_errors_immediately(self, make_record, tmp_path):
+        """Test that records at flush_level are written right away."""
+        log_file = tmp_path / "test.log"
+        handler = BufferedFileHandler(str(log_file))
+        
+        handler.handle(make_record("first", level=logging.INFO))
+        handler.handle(make_record("failure", level=logging.ERROR))
+        assert log_file.read_text() == "first\nfailure\n"
+        handler.close()
 
 
 class TestGetLogger:
@@ -255,13 +293,34 @@ class TestGetLogger:
         assert isinstance(logger, ContextLogger)
         assert logger.extra == context
 
+    def test_get_logger_equal_values_of_different_types(self):
+        """Test that 1 and True contexts don't share a cached prefix."""
+        int_logger = get_logger("test_module", context={"flag": 1})
+        bool_logger = get_logger("test_module", context={"flag": True})
+        assert int_logger.process("msg", {})[0] == "[flag=1] msg"
+        assert bool_logger.process("msg", {})[0] == "[flag=True] msg"
+
+    def test_get_logger_set_context_not_shared(self):
+        """Test that set_context on one logger doesn't affect another."""
+        logger1 = get_logger("test_module", context={"test_id": "test-789"})
+        logger2 = get_logger("test_module", context={"test_id": "test-789"})
+        logger1.set_context({"test_id": "other"})
+        assert logger2.process("msg", {})[0] == "[test_id=test-789] msg"
+
+    def test_get_logger_with_unhashable_context(self):
+        """Test that unhashable context values still produce a ContextLogger."""
+        context = {"hosts": ["a", "b"]}
+        logger = get_logger("test_module", context=context)
+        assert isinstance(logger, ContextLogger)
+        assert logger.extra == context
+
 
 class TestLogLevelFunctions:
     """Tests for log level management functions."""
 
-    def test_set_log_level(self):
+    def test_set_log_level(self, info_logger):
         """Test setting log level."""
-        logger = setup_logging(level="INFO")
+        logger = info_logger
         assert logger.level == logging.INFO
         
         set_log_level("DEBUG")
@@ -270,17 +329,18 @@ class TestLogLevelFunctions:
         set_log_level("WARNING")
         assert logger.level == logging.WARNING
 
-    def test_enable_debug_logging(self):
+    def test_enable_debug_logging(self, info_logger):
         """Test enabling debug logging."""
-        logger = setup_logging(level="INFO")
+        logger = info_logger
         assert logger.level == logging.INFO
         
         enable_debug_logging()
         assert logger.level == logging.DEBUG
 
-    def test_disable_debug_logging(self):
+    def test_disable_debug_logging(self, info_logger):
         """Test disabling debug logging."""
-        logger = setup_logging(level="DEBUG")
+        logger = info_logger
+        set_log_level("DEBUG")
         assert logger.level == logging.DEBUG
         
         disable_debug_logging()
@@ -290,3 +350,19 @@ class TestLogLevelFunctions:
         """Test that invalid log level defaults to INFO."""
         logger = setup_logging(level="INVALID")
         assert logger.level == logging.INFO
+
+
+class TestMaskAuthHeader:
+    """Tests for mask_auth_header."""
+
+    @pytest.mark.parametrize("header,expected", [
+        ("Bearer my-secret-token", "Bearer ***oken"),
+        ("Bearer\tabcdefg", "Bearer ***defg"),
+        (" Bearer abcdef", "Bearer ***cdef"),
+        ("Basic abc", "Basic ***"),
+        ("opaquetoken", "***oken"),
+        ("", ""),
+    ])
+    def test_masks_token_and_keeps_scheme(self, header, expected):
+        """Test that the scheme survives any whitespace and the token is masked."""
+        assert mask_auth_header(header) == expected
@@ -1,7 +1,9 @@
 """Tests for SSH infrastructure."""
 
+import copy
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, call
 
 from socket_load_test.config import SSHInfraConfig, SSHServerConfig
 from socket_load_test.core.infrastructure.ssh import SSHInfrastructure
@@ -12,9 +14,35 @@ from socket_load_test.utils.ssh_manager import (
 )
 
 
-@pytest.fixture
-def ssh_config():
-    """Create SSH configuration."""
+# ssh_manager.connect calls expected for the configuration below
+_EXPECTED_CONNECT_CALLS = [
+    call(
+        host="firewall.example.com",
+        port=22,
+        user="admin",
+        password="fw_password",
+        key_file=None,
+    ),
+    call(
+        host="gen1.example.com",
+        port=22,
+        user="loadtest",
+        password="gen1_password",
+        key_file=None,
+    ),
+    call(
+        host="gen2.example.com",
+        port=22,
+        user="loadtest",
+        password="gen2_password",
+        key_file=None,
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def _ssh_config_master():
+    """Build and validate the SSH configuration once per module."""
     return SSHInfraConfig(
         firewall_server=SSHServerConfig(
             host="firewall.example.com",
@@ -39,6 +67,12 @@ def ssh_config():
     )
 
 
+@pytest.fixture
+def ssh_config(_ssh_config_master):
+    """Provide an independent copy of the SSH configuration."""
+    return copy.deepcopy(_ssh_config_master)
+
+
 @pytest.fixture
 def ssh_infrastructure(ssh_config):
     """Create SSH infrastructure instance."""
@@ -48,10 +82,8 @@ def ssh_infrastructure(ssh_config):
 @pytest.fixture
 def mock_ssh_manager():
     """Create mock SSH manager."""
-    with patch("socket_load_test.core.infrastructure.ssh.SSHManager") as mock:
-        manager = MagicMock()
-        mock.return_value = manager
-        yield manager
+    with patch("socket_load_test.core.infrastructure.ssh.SSHManager") as mock_cls:
+        yield mock_cls.return_value
 
 
 class TestSSHInfrastructure:
@@ -69,34 +101,12 @@ class TestSSHInfrastructure:
 
         ssh_infrastructure.connect()
 
-        # Should connect to firewall + 2 load generators = 3 calls
+        # Should connect to firewall + 2 load generators = 3 calls, in order
         assert mock_ssh_manager.connect.call_count == 3
-
-        # Verify firewall connection
-        first_call = mock_ssh_manager.connect.call_args_list[0]
-        assert first_call[1]["host"] == "firewall.example.com"
-        assert first_call[1]["user"] == "admin"
-        assert first_call[1]["password"] == "fw_password"
-
-        # Verify load generator connections
-        second_call = mock_ssh_manager.connect.call_args_list[1]
-        assert second_call[1]["host"] == "gen1.example.com"
-
-        third_call = mock_ssh_manager.connect.call_args_list[2]
-        assert third_call[1]["host"] == "gen2.example.com"
+        mock_ssh_manager.connect.assert_has_calls(_EXPECTED_CONNECT_CALLS)
 
         assert ssh_infrastructure._connected is True
 
-    def test_connect_failure(self, ssh_infrastructure, mock_ssh_manager):
-        """Test connection failure handling."""
-        ssh_infrastructure.ssh_manager = mock_ssh_manager
-        mock_ssh_manager.connect.side_effect = SSHConnectionError("Connection failed")
-
-        with pytest.raises(SSHConnectionError):
-            ssh_infrastructure.connect()
-
-        assert ssh_infrastructure._connected is False
-
     def test_validate_connectivity_not_connected(self, ssh_infrastructure):
         """Test validate_connectivity when not connected."""
         result = ssh_infrastructure.validate_connectivity()
@@ -120,25 +130,21 @@ class TestSSHInfrastructure:
         # Should validate firewall + 2 generators = 3 calls
         assert mock_ssh_manager.execute_command.call_count == 3
 
-    def test_validate_connectivity_failure(self, ssh_infrastructure, mock_ssh_manager):
-        """Test connectivity validation with failures."""
-        ssh_infrastructure.ssh_manager = mock_ssh_manager
-        ssh_infrastructure._connected = True
-
-        # Mock failed command execution
-        mock_ssh_manager.execute_command.return_value = ("", "error", 1)
-
-        result = ssh_infrastructure.validate_connectivity()
-
-        assert result is False
-
-    def test_validate_connectivity_exception(self, ssh_infrastructure, mock_ssh_manager):
-        """Test connectivity validation with exception."""
+    @pytest.mark.parametrize(
+        "attr,value",
+        [
+            ("return_value", ("", "error", 1)),
+            ("side_effect", SSHCommandError("Command failed")),
+        ],
+        ids=["failure", "exception"],
+    )
+    def test_validate_connectivity_failure(
+        self, ssh_infrastructure, mock_ssh_manager, attr, value
+    ):
+        """Test connectivity validation with failing or raising commands."""
         ssh_infrastructure.ssh_manager = mock_ssh_manager
         ssh_infrastructure._connected = True
-
-        # Mock exception during command execution
-        mock_ssh_manager.execute_command.side_effect = SSHCommandError("Command failed")
+        setattr(mock_ssh_manager.execute_command, attr, value)
 
         result = ssh_infrastructure.validate_connectivity()
 
@@ -161,8 +167,15 @@ class TestSSHInfrastructure:
         with pytest.raises(ValueError, match="Invalid target"):
             ssh_infrastructure.setup_monitoring(target="invalid")
 
-    def test_execute_command_firewall(self, ssh_infrastructure, mock_ssh_manager):
-        """Test executing command on firewall."""
+    @pytest.mark.parametrize(
+        "target,expected_host",
+        [
+            ("firewall", "firewall.example.com"),
+            ("gen1.example.com", "gen1.example.com"),
+        ],
+    )
+    def test_execute_command(self, ssh_infrastructure, mock_ssh_manager, target, expected_host):
+        """Test executing command on the firewall and on a load generator."""
         ssh_infrastructure.ssh_manager = mock_ssh_manager
         mock_ssh_manager.execute_command.return_value = (
             "output",
@@ -171,7 +184,7 @@ class TestSSHInfrastructure:
         )
 
         result = ssh_infrastructure.execute_command(
-            target="firewall",
+            target=target,
             cmd="ls -la",
         )
 
@@ -179,27 +192,9 @@ class TestSSHInfrastructure:
         assert result["exit_code"] == 0
 
         call_args = mock_ssh_manager.execute_command.call_args[1]
-        assert call_args["host"] == "firewall.example.com"
+        assert call_args["host"] == expected_host
         assert call_args["command"] == "ls -la"
 
-    def test_execute_command_load_generator(self, ssh_infrastructure, mock_ssh_manager):
-        """Test executing command on load generator."""
-        ssh_infrastructure.ssh_manager = mock_ssh_manager
-        mock_ssh_manager.execute_command.return_value = (
-            "output",
-            "",
-            0,
-        )
-
-        result = ssh_infrastructure.execute_command(
-            target="gen1.example.com",
-            cmd="uptime",
-        )
-
-        assert result["stdout"] == "output"
-        call_args = mock_ssh_manager.execute_command.call_args[1]
-        assert call_args["host"] == "gen1.example.com"
-
     def test_execute_command_background(self, ssh_infrastructure, mock_ssh_manager):
         """Test executing background command."""
         ssh_infrastructure.ssh_manager = mock_ssh_manager
@@ -216,74 +211,62 @@ class TestSSHInfrastructure:
         assert "nohup" in call_args["command"]
         assert "&" in call_args["command"]
 
-    def test_execute_command_invalid_target(self, ssh_infrastructure):
-        """Test executing command on invalid target."""
-        with pytest.raises(ValueError, match="not found in configuration"):
-            ssh_infrastructure.execute_command(
-                target="invalid.example.com",
-                cmd="ls",
-            )
-
-    def test_execute_command_failure(self, ssh_infrastructure, mock_ssh_manager):
-        """Test command execution failure."""
-        ssh_infrastructure.ssh_manager = mock_ssh_manager
-        mock_ssh_manager.execute_command.side_effect = SSHCommandError("Failed")
-
-        with pytest.raises(SSHCommandError):
-            ssh_infrastructure.execute_command(
-                target="firewall",
-                cmd="failing_command",
-            )
-
-    def test_transfer_file_firewall(self, ssh_infrastructure, mock_ssh_manager):
-        """Test transferring file to firewall."""
+    @pytest.mark.parametrize(
+        "target,expected_host",
+        [
+            ("firewall", "firewall.example.com"),
+            ("gen2.example.com", "gen2.example.com"),
+        ],
+    )
+    def test_transfer_file(self, ssh_infrastructure, mock_ssh_manager, target, expected_host):
+        """Test transferring file to the firewall and to a load generator."""
         ssh_infrastructure.ssh_manager = mock_ssh_manager
 
         ssh_infrastructure.transfer_file(
             local="/local/path/file.txt",
             remote="/remote/path/file.txt",
-            target="firewall",
+            target=target,
         )
 
         mock_ssh_manager.transfer_file.assert_called_once()
         call_args = mock_ssh_manager.transfer_file.call_args[1]
-        assert call_args["host"] == "firewall.example.com"
+        assert call_args["host"] == expected_host
         assert call_args["local_path"] == "/local/path/file.txt"
         assert call_args["remote_path"] == "/remote/path/file.txt"
 
-    def test_transfer_file_load_generator(self, ssh_infrastructure, mock_ssh_manager):
-        """Test transferring file to load generator."""
-        ssh_infrastructure.ssh_manager = mock_ssh_manager
-
-        ssh_infrastructure.transfer_file(
-            local="/local/script.js",
-            remote="/tmp/script.js",
-            target="gen2.example.com",
-        )
-
-        call_args = mock_ssh_manager.transfer_file.call_args[1]
-        assert call_args["host"] == "gen2.example.com"
-
-    def test_transfer_file_invalid_target(self, ssh_infrastructure):
-        """Test transferring file to invalid target."""
+    @pytest.mark.parametrize(
+        "method,kwargs",
+        [
+            ("execute_command", {"cmd": "ls"}),
+            ("transfer_file", {"local": "/local/file", "remote": "/remote/file"}),
+        ],
+    )
+    def test_invalid_target(self, ssh_infrastructure, method, kwargs):
+        """Test that unknown targets are rejected."""
         with pytest.raises(ValueError, match="not found in configuration"):
-            ssh_infrastructure.transfer_file(
-                local="/local/file",
-                remote="/remote/file",
-                target="invalid.example.com",
-            )
-
-    def test_transfer_file_failure(self, ssh_infrastructure, mock_ssh_manager):
-        """Test file transfer failure."""
+            getattr(ssh_infrastructure, method)(target="invalid.example.com", **kwargs)
+
+    @pytest.mark.parametrize(
+        "method,exc,kwargs",
+        [
+            ("connect", SSHConnectionError, {}),
+            ("execute_command", SSHCommandError, {"target": "firewall", "cmd": "x"}),
+            (
+                "transfer_file",
+                SSHTransferError,
+                {"local": "/local/file", "remote": "/remote/file", "target": "firewall"},
+            ),
+        ],
+    )
+    def test_operation_failure(self, ssh_infrastructure, mock_ssh_manager, method, exc, kwargs):
+        """Test that SSH manager errors propagate to the caller."""
         ssh_infrastructure.ssh_manager = mock_ssh_manager
-        mock_ssh_manager.transfer_file.side_effect = SSHTransferError("Transfer failed")
+        getattr(mock_ssh_manager, method).side_effect = exc("fail")
+
+        with pytest.raises(exc):
+            getattr(ssh_infrastructure, method)(**kwargs)
 
-        with pytest.raises(SSHTransferError):
-            ssh_infrastructure.transfer_file(
-                local="/local/file",
-                remote="/remote/file",
-                target="firewall",
-            )
+        assert ssh_infrastructure._connected is False
 
     def test_get_firewall_endpoint(self, ssh_infrastructure):
         """Test getting firewall endpoint."""
@@ -324,6 +307,7 @@ class TestSSHInfrastructureIntegration:
         # Connect
         ssh_infrastructure.connect()
         assert ssh_infrastructure._connected is True
+        mock_ssh_manager.connect.assert_has_calls(_EXPECTED_CONNECT_CALLS)
 
         # Validate
         result = ssh_infrastructure.validate_connectivity()
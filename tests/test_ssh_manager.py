@@ -1,11 +1,12 @@
 """Tests for SSH manager."""
 
+import io
+import threading
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock, mock_open
-import paramiko
+from unittest.mock import Mock, patch, MagicMock
+from types import MappingProxyType, SimpleNamespace
 
+from socket_load_test.utils import ssh_manager as ssh_manager_module
 from socket_load_test.utils.ssh_manager import (
     SSHManager,
     SSHConnectionError,
@@ -14,20 +15,89 @@ from socket_load_test.utils.ssh_manager import (
 )
 
 
+# The exception class the manager catches; already imported by the module
+_AUTH_EXC = ssh_manager_module.AuthenticationException
+
+
+class _StubClient:
+    """Stand-in for paramiko's SSHClient with only the methods the manager calls."""
+
+    def __init__(self):
+        self.connect = Mock()
+        self.get_transport = Mock(return_value=Mock(is_active=Mock(return_value=True)))
+        self.close = Mock()
+        self.set_missing_host_key_policy = Mock()
+        self.exec_command = Mock()
+
+
+def _fake_streams(out=b"", err=b"", rc=0):
+    """Build the (stdin, stdout, stderr) triple returned by exec_command."""
+    stdout = SimpleNamespace(
+        read=io.BytesIO(out).read,
+        channel=SimpleNamespace(recv_exit_status=lambda: rc),
+    )
+    stderr = SimpleNamespace(read=io.BytesIO(err).read)
+    return None, stdout, stderr
+
+
+@pytest.fixture(autouse=True)
+def mock_client_class(monkeypatch):
+    """Replace SSHClient in the manager module with a mock class."""
+    cls = MagicMock()
+    monkeypatch.setattr("socket_load_test.utils.ssh_manager.SSHClient", cls)
+    return cls
+
+
+@pytest.fixture
+def mock_sftp_class(monkeypatch):
+    """Replace paramiko's SFTPClient with a mock class."""
+    cls = MagicMock()
+    monkeypatch.setattr(ssh_manager_module.paramiko, "SFTPClient", cls)
+    return cls
+
+
+@pytest.fixture
+def mock_path(monkeypatch):
+    """Replace Path in the manager module with a mock class."""
+    cls = MagicMock()
+    monkeypatch.setattr("socket_load_test.utils.ssh_manager.Path", cls)
+    return cls
+
+
 @pytest.fixture
-def ssh_manager():
+def ssh_manager_factory():
+    """Create SSH managers, closing all of them after the test."""
+    managers = []
+
+    def factory(**kwargs):
+        manager = SSHManager(**kwargs)
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        manager.close_all()
+
+
+@pytest.fixture
+def ssh_manager(ssh_manager_factory):
     """Create SSH manager instance."""
-    return SSHManager()
+    return ssh_manager_factory()
+
+
+@pytest.fixture(scope="module")
+def host_keys():
+    """Map (host, port, user) to the pool key the manager builds for it."""
+    return MappingProxyType({
+        ("test.example.com", 22, "root"): "root@test.example.com:22",
+        ("192.168.1.1", 2222, "admin"): "admin@192.168.1.1:2222",
+    })
 
 
 @pytest.fixture
 def mock_ssh_client():
-    """Create mock SSH client with transport."""
-    client = MagicMock()
-    transport = MagicMock()
-    transport.is_active.return_value = True
-    client.get_transport.return_value = transport
-    return client
+    """Create stub SSH client with an active transport."""
+    return _StubClient()
 
 
 class TestSSHManager:
@@ -38,20 +108,16 @@ class TestSSHManager:
         assert ssh_manager._connections == {}
         assert ssh_manager._lock is not None
 
-    def test_get_host_key(self, ssh_manager):
+    def test_get_host_key(self, ssh_manager, host_keys):
         """Test host key generation."""
-        key = ssh_manager._get_host_key("test.example.com", 22, "root")
-        assert key == "root@test.example.com:22"
-
-        key = ssh_manager._get_host_key("192.168.1.1", 2222, "admin")
-        assert key == "admin@192.168.1.1:2222"
+        for (host, port, user), expected in host_keys.items():
+            assert ssh_manager._get_host_key(host, port, user) == expected
 
     def test_connect_requires_auth(self, ssh_manager):
         """Test that connect requires either password or key."""
         with pytest.raises(ValueError, match="Either password or key_file must be provided"):
             ssh_manager.connect(host="test.example.com")
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
     def test_connect_with_password(self, mock_client_class, ssh_manager, mock_ssh_client):
         """Test connecting with password."""
         mock_client_class.return_value = mock_ssh_client
@@ -71,9 +137,9 @@ class TestSSHManager:
         assert call_kwargs["username"] == "testuser"
         assert call_kwargs["password"] == "secret123"
         assert call_kwargs["port"] == 22
+        assert "ssh-dss" in call_kwargs["disabled_algorithms"]["pubkeys"]
+        mock_ssh_client.get_transport.return_value.set_keepalive.assert_called_once_with(30)
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    @patch("socket_load_test.utils.ssh_manager.Path")
     def test_connect_with_key(self, mock_path, mock_client_class, ssh_manager, mock_ssh_client):
         """Test connecting with SSH key."""
         mock_client_class.return_value = mock_ssh_client
@@ -96,9 +162,26 @@ class TestSSHManager:
         assert "key_filename" in call_kwargs
         assert call_kwargs["key_filename"] == "/home/user/.ssh/id_rsa"
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    @patch("socket_load_test.utils.ssh_manager.Path")
-    def test_connect_key_not_found(self, mock_path, mock_client_class, ssh_manager):
+    def test_connect_key_file_validated_once(
+        self, mock_path, mock_client_class, ssh_manager, mock_ssh_client
+    ):
+        """Test that the key file is only checked on the first connect."""
+        mock_client_class.return_value = mock_ssh_client
+
+        mock_key_path = MagicMock()
+        mock_key_path.exists.return_value = True
+        mock_key_path.stat.return_value.st_mode = 0o100600
+        mock_key_path.__str__.return_value = "/home/user/.ssh/id_rsa"
+        mock_path.return_value.expanduser.return_value = mock_key_path
+
+        ssh_manager.connect(host="test.example.com", key_file="~/.ssh/id_rsa")
+        ssh_manager.close(host="test.example.com")
+        ssh_manager.connect(host="test.example.com", key_file="~/.ssh/id_rsa")
+
+        mock_key_path.exists.assert_called_once()
+        assert mock_ssh_client.connect.call_args[1]["key_filename"] == "/home/user/.ssh/id_rsa"
+
+    def test_connect_key_not_found(self, mock_path, ssh_manager):
         """Test connecting with non-existent key file."""
         mock_key_path = MagicMock()
         mock_key_path.exists.return_value = False
@@ -110,11 +193,10 @@ class TestSSHManager:
                 key_file="/nonexistent/key",
             )
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
     def test_connect_authentication_failed(self, mock_client_class, ssh_manager):
         """Test connection with authentication failure."""
-        mock_client = MagicMock()
-        mock_client.connect.side_effect = paramiko.AuthenticationException("Auth failed")
+        mock_client = _StubClient()
+        mock_client.connect.side_effect = _AUTH_EXC("Auth failed")
         mock_client_class.return_value = mock_client
 
         with pytest.raises(SSHConnectionError, match="Authentication failed"):
@@ -123,42 +205,77 @@ class TestSSHManager:
                 password="wrongpass",
             )
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    def test_connection_pooling(self, mock_client_class, ssh_manager, mock_ssh_client):
+    def test_connection_pooling(
+        self, mock_client_class, ssh_manager, mock_ssh_client, host_keys
+    ):
         """Test that connections are pooled and reused."""
         mock_client_class.return_value = mock_ssh_client
 
-        # First connection
         client1 = ssh_manager.connect(
             host="test.example.com",
             password="secret",
         )
 
-        # Second connection to same host should reuse
+        # The first connection is pooled under its host key
+        host_key = host_keys[("test.example.com", 22, "root")]
+        assert ssh_manager._connections[host_key].client is mock_ssh_client
+
+        # Second connection to same host should reuse it
         client2 = ssh_manager.connect(
             host="test.example.com",
             password="secret",
         )
 
-        assert client1 == client2
-        # Connect should only be called once
+        assert client1 is client2
+        assert mock_client_class.call_count == 1
         assert mock_ssh_client.connect.call_count == 1
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
+    def test_connection_reuse_skips_recent_probe(
+        self, mock_client_class, mock_ssh_client, ssh_manager_factory
+    ):
+        """Test that reuse within the probe interval skips the liveness check."""
+        mock_client_class.return_value = mock_ssh_client
+        manager = ssh_manager_factory(probe_interval=60)
+
+        manager.connect(host="test.example.com", password="secret")
+        manager.connect(host="test.example.com", password="secret")
+
+        mock_ssh_client.get_transport.return_value.is_active.assert_not_called()
+
+    def test_dead_connection_is_closed(self, mock_client_class, ssh_manager_factory):
+        """Test that a dead pooled connection is closed before reconnecting."""
+        dead_client, new_client = _StubClient(), _StubClient()
+        mock_client_class.side_effect = [dead_client, new_client]
+        manager = ssh_manager_factory(probe_interval=0)
+
+        manager.connect(host="test.example.com", password="secret")
+        dead_client.get_transport.return_value.is_active.return_value = False
+
+        assert manager.connect(host="test.example.com", password="secret") is new_client
+        dead_client.close.assert_called_once()
+
+    @patch("socket_load_test.utils.ssh_manager.time")
+    def test_idle_connections_expire(
+        self, mock_time, mock_client_class, mock_ssh_client, ssh_manager_factory
+    ):
+        """Test that connections idle past idle_timeout are closed."""
+        mock_client_class.return_value = mock_ssh_client
+        mock_time.monotonic.return_value = 100.0
+        manager = ssh_manager_factory(idle_timeout=30)
+
+        manager.connect(host="test.example.com", password="secret")
+        assert len(manager.get_active_connections()) == 1
+
+        mock_time.monotonic.return_value = 131.0
+        assert manager.get_active_connections() == []
+        mock_ssh_client.close.assert_called_once()
+
     def test_multiple_hosts(self, mock_client_class, ssh_manager):
         """Test connecting to multiple hosts."""
-        mock_client1 = MagicMock()
-        mock_client2 = MagicMock()
+        mock_client1 = _StubClient()
+        mock_client2 = _StubClient()
         mock_client_class.side_effect = [mock_client1, mock_client2]
 
-        transport1 = MagicMock()
-        transport1.is_active.return_value = True
-        mock_client1.get_transport.return_value = transport1
-
-        transport2 = MagicMock()
-        transport2.is_active.return_value = True
-        mock_client2.get_transport.return_value = transport2
-
         # Connect to first host
         client1 = ssh_manager.connect(host="host1.com", password="pass1")
 
@@ -168,7 +285,6 @@ class TestSSHManager:
         assert client1 != client2
         assert len(ssh_manager.get_active_connections()) == 2
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
     def test_execute_command(self, mock_client_class, ssh_manager, mock_ssh_client):
         """Test command execution."""
         mock_client_class.return_value = mock_ssh_client
@@ -177,15 +293,7 @@ class TestSSHManager:
         ssh_manager.connect(host="test.example.com", password="secret")
 
         # Mock command execution
-        mock_stdin = MagicMock()
-        mock_stdout = MagicMock()
-        mock_stdout.read.return_value = b"command output"
-        mock_stdout.channel.recv_exit_status.return_value = 0
-
-        mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b""
-
-        mock_ssh_client.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
+        mock_ssh_client.exec_command.return_value = _fake_streams(b"command output")
 
         # Execute command
         stdout, stderr, exit_code = ssh_manager.execute_command(
@@ -198,8 +306,48 @@ class TestSSHManager:
         assert exit_code == 0
         mock_ssh_client.exec_command.assert_called_once()
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    def test_execute_command_not_connected(self, mock_client_class, ssh_manager):
+    def test_execute_commands_batch(self, mock_client_class, ssh_manager, mock_ssh_client):
+        """Test executing several commands over one connection."""
+        mock_client_class.return_value = mock_ssh_client
+        ssh_manager.connect(host="test.example.com", password="secret")
+
+        def exec_command(command, timeout=None):
+            return _fake_streams(command.encode())
+
+        mock_ssh_client.exec_command.side_effect = exec_command
+
+        results = ssh_manager.execute_commands_batch(
+            host="test.example.com",
+            commands=["echo a", "echo b", "echo c"],
+        )
+
+        assert results == [("echo a", "", 0), ("echo b", "", 0), ("echo c", "", 0)]
+        assert mock_ssh_client.exec_command.call_count == 3
+
+    def test_execute_command_max_output_bytes(
+        self, mock_client_class, ssh_manager, mock_ssh_client
+    ):
+        """Test that output is truncated but still fully drained."""
+        mock_client_class.return_value = mock_ssh_client
+        ssh_manager.connect(host="test.example.com", password="secret")
+
+        mock_stdout = MagicMock()
+        mock_stdout.read.side_effect = [b"x" * 65536, b"tail"]
+        mock_stdout.channel.recv_exit_status.return_value = 0
+        mock_stderr = MagicMock()
+        mock_stderr.read.return_value = b""
+        mock_ssh_client.exec_command.return_value = (None, mock_stdout, mock_stderr)
+
+        stdout, stderr, exit_code = ssh_manager.execute_command(
+            host="test.example.com",
+            command="cat big.log",
+            max_output_bytes=10,
+        )
+
+        assert stdout == "x" * 10
+        assert mock_stdout.read.call_count == 2
+
+    def test_execute_command_not_connected(self, ssh_manager):
         """Test executing command without connection."""
         with pytest.raises(SSHConnectionError, match="No active connection"):
             ssh_manager.execute_command(
@@ -207,21 +355,13 @@ class TestSSHManager:
                 command="echo test",
             )
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
     def test_execute_command_with_error(self, mock_client_class, ssh_manager, mock_ssh_client):
         """Test command execution that returns error."""
         mock_client_class.return_value = mock_ssh_client
         ssh_manager.connect(host="test.example.com", password="secret")
 
         # Mock failed command
-        mock_stdout = MagicMock()
-        mock_stdout.read.return_value = b""
-        mock_stdout.channel.recv_exit_status.return_value = 1
-
-        mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b"command failed"
-
-        mock_ssh_client.exec_command.return_value = (None, mock_stdout, mock_stderr)
+        mock_ssh_client.exec_command.return_value = _fake_streams(err=b"command failed", rc=1)
 
         stdout, stderr, exit_code = ssh_manager.execute_command(
             host="test.example.com",
@@ -231,9 +371,9 @@ class TestSSHManager:
         assert exit_code == 1
         assert stderr == "command failed"
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    @patch("socket_load_test.utils.ssh_manager.Path")
-    def test_transfer_file(self, mock_path_class, mock_client_class, ssh_manager, mock_ssh_client):
+    def test_transfer_file(
+        self, mock_path, mock_sftp_class, mock_client_class, ssh_manager, mock_ssh_client
+    ):
         """Test file transfer."""
         mock_client_class.return_value = mock_ssh_client
 
@@ -241,11 +381,11 @@ class TestSSHManager:
         mock_local_path = MagicMock()
         mock_local_path.exists.return_value = True
         mock_local_path.__str__.return_value = "/local/file.txt"
-        mock_path_class.return_value.expanduser.return_value = mock_local_path
+        mock_path.return_value.expanduser.return_value = mock_local_path
 
         # Mock SFTP
         mock_sftp = MagicMock()
-        mock_ssh_client.open_sftp.return_value = mock_sftp
+        mock_sftp_class.from_transport.return_value = mock_sftp
 
         # Connect and transfer
         ssh_manager.connect(host="test.example.com", password="secret")
@@ -255,16 +395,78 @@ class TestSSHManager:
             remote_path="/remote/file.txt",
         )
 
-        mock_sftp.put.assert_called_once_with("/local/file.txt", "/remote/file.txt")
+        mock_sftp.putfo.assert_called_once()
+        assert mock_sftp.putfo.call_args.args[1] == "/remote/file.txt"
+        assert mock_sftp.putfo.call_args.kwargs["confirm"] is False
+        # Only the SFTP channel gets the large window, not the shared transport
+        transport = mock_ssh_client.get_transport.return_value
+        mock_sftp_class.from_transport.assert_called_once_with(
+            transport, window_size=2 ** 27, max_packet_size=32768
+        )
+        assert not isinstance(transport.default_window_size, int)
+
+        # SFTP session is kept open for reuse until the connection closes
+        mock_sftp.close.assert_not_called()
+        ssh_manager.transfer_file(
+            host="test.example.com",
+            local_path="/local/file.txt",
+            remote_path="/remote/other.txt",
+        )
+        mock_sftp_class.from_transport.assert_called_once()
+
+        ssh_manager.close(host="test.example.com")
         mock_sftp.close.assert_called_once()
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    @patch("socket_load_test.utils.ssh_manager.Path")
-    def test_transfer_file_not_found(self, mock_path_class, mock_client_class, ssh_manager):
+    def test_transfer_file_caches_remote_dirs(
+        self, mock_path, mock_sftp_class, mock_client_class, ssh_manager, mock_ssh_client
+    ):
+        """Test that remote directories are only checked once per connection."""
+        mock_client_class.return_value = mock_ssh_client
+        mock_local_path = MagicMock()
+        mock_local_path.exists.return_value = True
+        mock_path.return_value.expanduser.return_value = mock_local_path
+
+        mock_sftp = MagicMock()
+        mock_sftp.stat.side_effect = FileNotFoundError
+        mock_sftp_class.from_transport.return_value = mock_sftp
+
+        ssh_manager.connect(host="test.example.com", password="secret")
+        ssh_manager.transfer_file("test.example.com", "/local/a.txt", "/remote/data/a.txt")
+        ssh_manager.transfer_file("test.example.com", "/local/b.txt", "/remote/data/b.txt")
+
+        mkdirs = [c.args[0] for c in mock_sftp.mkdir.call_args_list]
+        assert mkdirs == ["/remote", "/remote/data"]
+        # Parent check plus one per created directory, all from the first transfer
+        assert mock_sftp.stat.call_count == 3
+
+    def test_transfer_file_failure_forgets_remote_dirs(
+        self, mock_path, mock_sftp_class, mock_client_class, ssh_manager, mock_ssh_client
+    ):
+        """Test that a failed transfer drops the session and the directory cache."""
+        mock_client_class.return_value = mock_ssh_client
+        mock_local_path = MagicMock()
+        mock_local_path.exists.return_value = True
+        mock_path.return_value.expanduser.return_value = mock_local_path
+
+        mock_sftp = MagicMock()
+        mock_sftp.putfo.side_effect = [None, IOError("No such file"), None]
+        mock_sftp_class.from_transport.return_value = mock_sftp
+
+        ssh_manager.connect(host="test.example.com", password="secret")
+        ssh_manager.transfer_file("test.example.com", "/local/a.txt", "/remote/data/a.txt")
+        with pytest.raises(SSHTransferError):
+            ssh_manager.transfer_file("test.example.com", "/local/b.txt", "/remote/data/b.txt")
+        ssh_manager.transfer_file("test.example.com", "/local/c.txt", "/remote/data/c.txt")
+
+        assert mock_sftp_class.from_transport.call_count == 2
+        # The directory is checked again after the failure
+        assert mock_sftp.stat.call_count == 2
+
+    def test_transfer_file_not_found(self, mock_path, ssh_manager):
         """Test transferring non-existent file."""
         mock_local_path = MagicMock()
         mock_local_path.exists.return_value = False
-        mock_path_class.return_value.expanduser.return_value = mock_local_path
+        mock_path.return_value.expanduser.return_value = mock_local_path
 
         with pytest.raises(FileNotFoundError, match="Local file not found"):
             ssh_manager.transfer_file(
@@ -273,35 +475,46 @@ class TestSSHManager:
                 remote_path="/remote/file.txt",
             )
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    def test_close_connection(self, mock_client_class, ssh_manager, mock_ssh_client):
+    def test_close_connection(self, mock_client_class, ssh_manager, mock_ssh_client, host_keys):
         """Test closing a specific connection."""
         mock_client_class.return_value = mock_ssh_client
 
         # Connect
         ssh_manager.connect(host="test.example.com", password="secret")
-        assert len(ssh_manager.get_active_connections()) == 1
+        assert ssh_manager.get_active_connections() == [
+            host_keys[("test.example.com", 22, "root")]
+        ]
 
         # Close
         ssh_manager.close(host="test.example.com")
         assert len(ssh_manager.get_active_connections()) == 0
         mock_ssh_client.close.assert_called_once()
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
+    def test_close_waits_for_transfer(
+        self, mock_client_class, ssh_manager, mock_ssh_client, host_keys
+    ):
+        """Test that closing a connection waits for an in-flight transfer."""
+        mock_client_class.return_value = mock_ssh_client
+        ssh_manager.connect(host="test.example.com", password="secret")
+        entry = ssh_manager._connections[host_keys[("test.example.com", 22, "root")]]
+
+        # Holding the SFTP lock stands in for a transfer in progress
+        with entry.sftp_lock:
+            closer = threading.Thread(target=ssh_manager.close, args=("test.example.com",))
+            closer.start()
+            closer.join(0.1)
+            assert closer.is_alive()
+            mock_ssh_client.close.assert_not_called()
+        closer.join(1)
+
+        mock_ssh_client.close.assert_called_once()
+
     def test_close_all_connections(self, mock_client_class, ssh_manager):
         """Test closing all connections."""
-        mock_client1 = MagicMock()
-        mock_client2 = MagicMock()
+        mock_client1 = _StubClient()
+        mock_client2 = _StubClient()
         mock_client_class.side_effect = [mock_client1, mock_client2]
 
-        transport1 = MagicMock()
-        transport1.is_active.return_value = True
-        mock_client1.get_transport.return_value = transport1
-
-        transport2 = MagicMock()
-        transport2.is_active.return_value = True
-        mock_client2.get_transport.return_value = transport2
-
         # Connect to multiple hosts
         ssh_manager.connect(host="host1.com", password="pass1")
         ssh_manager.connect(host="host2.com", password="pass2")
@@ -314,12 +527,11 @@ class TestSSHManager:
         mock_client1.close.assert_called_once()
         mock_client2.close.assert_called_once()
 
-    @patch("socket_load_test.utils.ssh_manager.SSHClient")
-    def test_context_manager(self, mock_client_class, mock_ssh_client):
+    def test_context_manager(self, mock_client_class, mock_ssh_client, ssh_manager):
         """Test using SSHManager as context manager."""
         mock_client_class.return_value = mock_ssh_client
 
-        with SSHManager() as manager:
+        with ssh_manager as manager:
             manager.connect(host="test.example.com", password="secret")
             assert len(manager.get_active_connections()) == 1
 
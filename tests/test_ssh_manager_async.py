@@ -0,0 +1,248 @@
+"""Tests for async SSH manager."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from socket_load_test.utils import ssh_manager_async
+from socket_load_test.utils.ssh_manager import SSHConnectionError, SSHTransferError
+from socket_load_test.utils.ssh_manager_async import AsyncSSHManager
+
+
+class _FakeAsyncSSHError(Exception):
+    """Stand-in for asyncssh.Error."""
+
+
+class _FakePermissionDenied(_FakeAsyncSSHError):
+    """Stand-in for asyncssh.PermissionDenied."""
+
+
+def _fake_connection(stdout=b"", stderr=b"", exit_status=0):
+    """Build an open connection as returned by asyncssh.connect."""
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.wait_closed = AsyncMock()
+    conn.run = AsyncMock(
+        return_value=SimpleNamespace(stdout=stdout, stderr=stderr, exit_status=exit_status)
+    )
+    sftp = MagicMock()
+    sftp.makedirs = AsyncMock()
+    sftp.put = AsyncMock()
+    conn.start_sftp_client = AsyncMock(return_value=sftp)
+    return conn
+
+
+@pytest.fixture(autouse=True)
+def mock_asyncssh(monkeypatch):
+    """Replace the asyncssh module so tests run without it installed."""
+    fake = SimpleNamespace(
+        connect=AsyncMock(side_effect=lambda host, **kwargs: _fake_connection()),
+        Error=_FakeAsyncSSHError,
+        PermissionDenied=_FakePermissionDenied,
+    )
+    monkeypatch.setattr(ssh_manager_async, "asyncssh", fake)
+    return fake
+
+
+def test_requires_asyncssh(monkeypatch):
+    """Test that a helpful error is raised without asyncssh."""
+    monkeypatch.setattr(ssh_manager_async, "asyncssh", None)
+
+    with pytest.raises(ImportError, match="pip install socket-load-test\\[async\\]"):
+        AsyncSSHManager()
+
+
+class TestAsyncSSHManager:
+    """Test suite for AsyncSSHManager."""
+
+    def test_get_host_key(self):
+        """Test host key generation."""
+        manager = AsyncSSHManager()
+        assert manager._get_host_key("test.example.com", 22, "root") == "root@test.example.com:22"
+
+    def test_connect_requires_auth(self):
+        """Test that connect requires either password or key."""
+        manager = AsyncSSHManager()
+        with pytest.raises(ValueError, match="Either password or key_file must be provided"):
+            asyncio.run(manager.connect(host="test.example.com"))
+
+    def test_execute_command_not_connected(self):
+        """Test executing command without connection."""
+        manager = AsyncSSHManager()
+        with pytest.raises(SSHConnectionError, match="No active connection"):
+            asyncio.run(manager.execute_command(host="test.example.com", command="echo test"))
+
+    def test_connect_with_password(self, mock_asyncssh):
+        """Test connecting with password and reusing the pooled connection."""
+        manager = AsyncSSHManager()
+
+        async def run():
+            conn1 = await manager.connect(host="test.example.com", password="secret")
+            conn2 = await manager.connect(host="test.example.com", password="secret")
+            return conn1, conn2
+
+        conn1, conn2 = asyncio.run(run())
+
+        assert conn1 is conn2
+        mock_asyncssh.connect.assert_awaited_once()
+        call = mock_asyncssh.connect.call_args
+        assert call.args == ("test.example.com",)
+        assert call.kwargs["password"] == "secret"
+        assert call.kwargs["known_hosts"] is None
+        # Same algorithm restrictions as the sync manager
+        assert "diffie-hellman-group14-sha1" in call.kwargs["kex_algs"].split(",")
+        assert call.kwargs["kex_algs"].startswith("-")
+        assert call.kwargs["server_host_key_algs"] == "-ssh-rsa"
+        assert manager.get_active_connections() == ["root@test.example.com:22"]
+
+    def test_concurrent_connects_share_handshake(self, mock_asyncssh):
+        """Test that concurrent connects to one host open a single connection."""
+        manager = AsyncSSHManager()
+
+        async def run():
+            return await asyncio.gather(
+                *(manager.connect(host="test.example.com", password="secret") for _ in range(3))
+            )
+
+        conns = asyncio.run(run())
+
+        assert mock_asyncssh.connect.await_count == 1
+        assert conns[0] is conns[1] is conns[2]
+
+    def test_connects_to_different_hosts_overlap(self, mock_asyncssh):
+        """Test that a slow handshake does not block connects to other hosts."""
+        manager = AsyncSSHManager()
+
+        async def run():
+            second_started = asyncio.Event()
+
+            async def connect(host, **kwargs):
+                if host == "slow.example.com":
+                    # Only completes if the other host's connect runs meanwhile
+                    await asyncio.wait_for(second_started.wait(), 1)
+                else:
+                    second_started.set()
+                return _fake_connection()
+
+            mock_asyncssh.connect.side_effect = connect
+            await asyncio.gather(
+                manager.connect(host="slow.example.com", password="secret"),
+                manager.connect(host="fast.example.com", password="secret"),
+            )
+
+        asyncio.run(run())
+
+        assert len(manager.get_active_connections()) == 2
+
+    def test_connect_authentication_failure(self, mock_asyncssh):
+        """Test that authentication errors are wrapped."""
+        mock_asyncssh.connect.side_effect = _FakePermissionDenied("denied")
+        manager = AsyncSSHManager()
+
+        with pytest.raises(SSHConnectionError, match="Authentication failed"):
+            asyncio.run(manager.connect(host="test.example.com", password="wrong"))
+        assert manager.get_active_connections() == []
+
+    def test_close_all(self):
+        """Test closing all connections."""
+        manager = AsyncSSHManager()
+
+        async def run():
+            conn1 = await manager.connect(host="host1.example.com", password="secret")
+            conn2 = await manager.connect(host="host2.example.com", password="secret")
+            await manager.close_all()
+            return conn1, conn2
+
+        for conn in asyncio.run(run()):
+            conn.close.assert_called_once()
+            conn.wait_closed.assert_awaited_once()
+        assert manager.get_active_connections() == []
+
+    def test_execute_command(self, mock_asyncssh):
+        """Test command execution decodes output and reports the exit code."""
+        mock_asyncssh.connect.side_effect = None
+        mock_asyncssh.connect.return_value = _fake_connection(
+            stdout=b"hello\n", stderr=b"warn\xff", exit_status=3
+        )
+        manager = AsyncSSHManager()
+
+        async def run():
+            conn = await manager.connect(host="test.example.com", password="secret")
+            return conn, await manager.execute_command("test.example.com", "echo hello")
+
+        conn, result = asyncio.run(run())
+
+        assert result == ("hello\n", "warn\ufffd", 3)
+        conn.run.assert_awaited_once_with("echo hello", check=False, encoding=None)
+
+    def test_execute_on_hosts(self, mock_asyncssh):
+        """Test that results come back in the order of the hosts."""
+        outputs = {"host1.example.com": b"one", "host2.example.com": b"two"}
+        mock_asyncssh.connect.side_effect = lambda host, **kwargs: _fake_connection(
+            stdout=outputs[host]
+        )
+        manager = AsyncSSHManager()
+
+        async def run():
+            for host in outputs:
+                await manager.connect(host=host, password="secret")
+            return await manager.execute_on_hosts(
+                ["host2.example.com", "host1.example.com"], "hostname"
+            )
+
+        assert asyncio.run(run()) == [("two", "", 0), ("one", "", 0)]
+
+    def test_transfer_file_reuses_sftp_client(self, tmp_path):
+        """Test that transfers on one connection share an SFTP client."""
+        local_file = tmp_path / "file.txt"
+        local_file.write_text("data")
+        manager = AsyncSSHManager()
+
+        async def run():
+            conn = await manager.connect(host="test.example.com", password="secret")
+            await manager.transfer_file("test.example.com", str(local_file), "/remote/a.txt")
+            await manager.transfer_file("test.example.com", str(local_file), "/remote/b.txt")
+            return conn
+
+        conn = asyncio.run(run())
+
+        conn.start_sftp_client.assert_awaited_once()
+        sftp = conn.start_sftp_client.return_value
+        sftp.makedirs.assert_awaited_with("/remote", exist_ok=True)
+        assert [c.args for c in sftp.put.await_args_list] == [
+            (str(local_file), "/remote/a.txt"),
+            (str(local_file), "/remote/b.txt"),
+        ]
+
+    def test_transfer_file_failure_drops_sftp_client(self, tmp_path):
+        """Test that a failed transfer closes the SFTP client instead of reusing it."""
+        local_file = tmp_path / "file.txt"
+        local_file.write_text("data")
+        manager = AsyncSSHManager()
+
+        async def run():
+            conn = await manager.connect(host="test.example.com", password="secret")
+            sftp = conn.start_sftp_client.return_value
+            sftp.put.side_effect = [OSError("disk full"), None]
+            with pytest.raises(SSHTransferError, match="disk full"):
+                await manager.transfer_file("test.example.com", str(local_file), "/remote/a.txt")
+            await manager.transfer_file("test.example.com", str(local_file), "/remote/a.txt")
+            return conn, sftp
+
+        conn, sftp = asyncio.run(run())
+
+        sftp.exit.assert_called_once()
+        assert conn.start_sftp_client.await_count == 2
+
+    def test_transfer_file_not_found(self, tmp_path):
+        """Test transferring a non-existent local file."""
+        manager = AsyncSSHManager()
+
+        with pytest.raises(FileNotFoundError, match="Local file not found"):
+            asyncio.run(
+                manager.transfer_file(
+                    "test.example.com", str(tmp_path / "missing.txt"), "/remote/a.txt"
+                )
+            )
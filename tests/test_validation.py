@@ -1,7 +1,6 @@
 """Tests for validation utilities."""
 
-import tempfile
-from pathlib import Path
+import os
 
 import pytest
 
@@ -26,11 +25,10 @@ from socket_load_test.utils.validation import (
 class TestValidatePositiveInt:
     """Tests for validate_positive_int."""
 
-    def test_valid_positive_int(self):
+    @pytest.mark.parametrize("value", [10, 1, 1000])
+    def test_valid_positive_int(self, value):
         """Test with valid positive integer."""
-        assert validate_positive_int(10, "test_value") == 10
-        assert validate_positive_int(1, "test_value") == 1
-        assert validate_positive_int(1000, "test_value") == 1000
+        assert validate_positive_int(value, "test_value") == value
 
     def test_with_custom_min_value(self):
         """Test with custom minimum value."""
@@ -39,33 +37,28 @@ class TestValidatePositiveInt:
         with pytest.raises(ValidationError, match="must be >= 10"):
             validate_positive_int(5, "test_value", min_value=10)
 
-    def test_zero_fails(self):
-        """Test that zero fails validation."""
-        with pytest.raises(ValidationError, match="must be >= 1"):
-            validate_positive_int(0, "test_value")
-
-    def test_negative_fails(self):
-        """Test that negative values fail."""
-        with pytest.raises(ValidationError, match="must be >= 1"):
-            validate_positive_int(-5, "test_value")
-
-    def test_non_integer_fails(self):
-        """Test that non-integer values fail."""
-        with pytest.raises(ValidationError, match="must be an integer"):
-            validate_positive_int(10.5, "test_value")
-        
-        with pytest.raises(ValidationError, match="must be an integer"):
-            validate_positive_int("10", "test_value")
+    @pytest.mark.parametrize(
+        "value,msg",
+        [
+            (0, "must be >= 1"),
+            (-5, "must be >= 1"),
+            (10.5, "must be an integer"),
+            ("10", "must be an integer"),
+        ],
+    )
+    def test_invalid_fails(self, value, msg):
+        """Test that zero, negative and non-integer values fail."""
+        with pytest.raises(ValidationError, match=msg):
+            validate_positive_int(value, "test_value")
 
 
 class TestValidatePositiveFloat:
     """Tests for validate_positive_float."""
 
-    def test_valid_positive_float(self):
+    @pytest.mark.parametrize("value", [10.5, 0.1, 1000.99])
+    def test_valid_positive_float(self, value):
         """Test with valid positive float."""
-        assert validate_positive_float(10.5, "test_value") == 10.5
-        assert validate_positive_float(0.1, "test_value") == 0.1
-        assert validate_positive_float(1000.99, "test_value") == 1000.99
+        assert validate_positive_float(value, "test_value") == value
 
     def test_accepts_int(self):
         """Test that integers are accepted and converted to float."""
@@ -90,22 +83,16 @@ class TestValidatePositiveFloat:
 class TestValidatePercentage:
     """Tests for validate_percentage."""
 
-    def test_valid_percentage(self):
+    @pytest.mark.parametrize("value", [0, 50, 100, 33.33])
+    def test_valid_percentage(self, value):
         """Test with valid percentage values."""
-        assert validate_percentage(0, "test") == 0.0
-        assert validate_percentage(50, "test") == 50.0
-        assert validate_percentage(100, "test") == 100.0
-        assert validate_percentage(33.33, "test") == 33.33
-
-    def test_below_zero_fails(self):
-        """Test that negative percentages fail."""
-        with pytest.raises(ValidationError, match="must be >= 0"):
-            validate_percentage(-1, "test")
-
-    def test_above_100_fails(self):
-        """Test that percentages > 100 fail."""
-        with pytest.raises(ValidationError, match="must be <= 100"):
-            validate_percentage(101, "test")
+        assert validate_percentage(value, "test") == float(value)
+
+    @pytest.mark.parametrize("value,msg", [(-1, "must be >= 0"), (101, "must be <= 100")])
+    def test_out_of_range_fails(self, value, msg):
+        """Test that percentages below 0 or above 100 fail."""
+        with pytest.raises(ValidationError, match=msg):
+            validate_percentage(value, "test")
 
 
 class TestParseDuration:
@@ -218,68 +205,81 @@ class TestValidateUrl:
             validate_url("", "test_url")
 
 
+@pytest.fixture(scope="module")
+def path_sandbox(tmp_path_factory):
+    """Provide one directory holding a file.txt and a subdir for path tests.
+
+    Tests that create paths must use names unique to the test.
+    """
+    sandbox = tmp_path_factory.mktemp("validate_path")
+    (sandbox / "file.txt").touch()
+    (sandbox / "subdir").mkdir()
+    return sandbox
+
+
 class TestValidatePath:
     """Tests for validate_path."""
 
-    def test_valid_path(self):
+    def test_valid_path(self, path_sandbox):
         """Test with valid path."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "test.txt"
-            path.touch()
-            
-            result = validate_path(str(path), "test_path", must_exist=True)
-            # Use samefile() to handle macOS /private symlink
-            assert result.samefile(path)
+        path = path_sandbox / "file.txt"
+        
+        result = validate_path(str(path), "test_path", must_exist=True)
+        # Use samefile() to handle macOS /private symlink
+        assert result.samefile(path)
+
+    def test_must_exist_treats_windows_not_found_as_missing(self, monkeypatch):
+        """Test that Windows "not found" errors are reported as missing."""
+        real_stat = os.stat
+
+        def fake_stat(path, *args, **kwargs):
+            if os.path.basename(path) != "bad-name":
+                return real_stat(path, *args, **kwargs)
+            error = OSError(22, "The filename, directory name, or volume label syntax is incorrect")
+            error.winerror = 123
+            raise error
+
+        monkeypatch.setattr(os, "stat", fake_stat)
+
+        with pytest.raises(ValidationError, match="does not exist"):
+            validate_path(os.path.join(os.sep, "bad-name"), "test_path", must_exist=True)
 
     def test_must_exist_fails_when_missing(self):
         """Test that must_exist fails for non-existent path."""
         with pytest.raises(ValidationError, match="does not exist"):
             validate_path("/non/existent/path", "test_path", must_exist=True)
 
-    def test_must_be_file(self):
+    def test_must_be_file(self, path_sandbox):
         """Test must_be_file validation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = Path(tmpdir) / "file.txt"
-            file_path.touch()
-            dir_path = Path(tmpdir) / "subdir"
-            dir_path.mkdir()
-            
-            # File should pass
-            validate_path(str(file_path), "test", must_be_file=True)
-            
-            # Directory should fail
-            with pytest.raises(ValidationError, match="must be a file"):
-                validate_path(str(dir_path), "test", must_be_file=True)
-
-    def test_must_be_dir(self):
+        # File should pass
+        validate_path(str(path_sandbox / "file.txt"), "test", must_be_file=True)
+        
+        # Directory should fail
+        with pytest.raises(ValidationError, match="must be a file"):
+            validate_path(str(path_sandbox / "subdir"), "test", must_be_file=True)
+
+    def test_must_be_dir(self, path_sandbox):
         """Test must_be_dir validation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            file_path = Path(tmpdir) / "file.txt"
-            file_path.touch()
-            dir_path = Path(tmpdir) / "subdir"
-            dir_path.mkdir()
-            
-            # Directory should pass
-            validate_path(str(dir_path), "test", must_be_dir=True)
-            
-            # File should fail
-            with pytest.raises(ValidationError, match="must be a directory"):
-                validate_path(str(file_path), "test", must_be_dir=True)
-
-    def test_create_if_missing(self):
+        # Directory should pass
+        validate_path(str(path_sandbox / "subdir"), "test", must_be_dir=True)
+        
+        # File should fail
+        with pytest.raises(ValidationError, match="must be a directory"):
+            validate_path(str(path_sandbox / "file.txt"), "test", must_be_dir=True)
+
+    def test_create_if_missing(self, path_sandbox):
         """Test creating directory if missing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            new_dir = Path(tmpdir) / "new" / "nested" / "dir"
-            
-            result = validate_path(
-                str(new_dir),
-                "test",
-                must_be_dir=True,
-                create_if_missing=True
-            )
-            
-            assert result.exists()
-            assert result.is_dir()
+        new_dir = path_sandbox / "new" / "nested" / "dir"
+        
+        result = validate_path(
+            str(new_dir),
+            "test",
+            must_be_dir=True,
+            create_if_missing=True
+        )
+        
+        assert result.exists()
+        assert result.is_dir()
 
     def test_empty_path_fails(self):
         """Test that empty path fails."""
@@ -291,26 +291,31 @@ class TestValidatePath:
         result = validate_path("~/test", "test_path")
         assert "~" not in str(result)
 
+    def test_tilde_follows_home_changes(self, monkeypatch, tmp_path):
+        """Test that ~ expands against HOME as it is when called."""
+        # expanduser reads USERPROFILE instead on Windows
+        for var in ("HOME", "USERPROFILE"):
+            monkeypatch.setenv(var, str(tmp_path / "first"))
+        validate_path("~/test", "test_path")
+        for var in ("HOME", "USERPROFILE"):
+            monkeypatch.setenv(var, str(tmp_path / "second"))
+
+        assert validate_path("~/test", "test_path") == tmp_path / "second" / "test"
+
 
 class TestValidatePort:
     """Tests for validate_port."""
 
-    def test_valid_ports(self):
+    @pytest.mark.parametrize("port", [80, 443, 8080, 65535])
+    def test_valid_ports(self, port):
         """Test with valid port numbers."""
-        assert validate_port(80, "test_port") == 80
-        assert validate_port(443, "test_port") == 443
-        assert validate_port(8080, "test_port") == 8080
-        assert validate_port(65535, "test_port") == 65535
+        assert validate_port(port, "test_port") == port
 
-    def test_port_too_low_fails(self):
-        """Test that port < 1 fails."""
+    @pytest.mark.parametrize("port", [0, 65536])
+    def test_port_out_of_range_fails(self, port):
+        """Test that ports outside 1-65535 fail."""
         with pytest.raises(ValidationError, match="must be between 1 and 65535"):
-            validate_port(0, "test_port")
-
-    def test_port_too_high_fails(self):
-        """Test that port > 65535 fails."""
-        with pytest.raises(ValidationError, match="must be between 1 and 65535"):
-            validate_port(65536, "test_port")
+            validate_port(port, "test_port")
 
     def test_non_integer_fails(self):
         """Test that non-integer fails."""
@@ -350,21 +355,16 @@ class TestValidateHostname:
 class TestValidateRps:
     """Tests for validate_rps."""
 
-    def test_valid_rps(self):
+    @pytest.mark.parametrize("rps", [100, 1000, 1])
+    def test_valid_rps(self, rps):
         """Test with valid RPS values."""
-        assert validate_rps(100) == 100
-        assert validate_rps(1000) == 1000
-        assert validate_rps(1) == 1
+        assert validate_rps(rps) == rps
 
-    def test_zero_rps_fails(self):
-        """Test that zero RPS fails."""
+    @pytest.mark.parametrize("rps", [0, -100])
+    def test_non_positive_rps_fails(self, rps):
+        """Test that zero and negative RPS fail."""
         with pytest.raises(ValidationError, match="must be >= 1"):
-            validate_rps(0)
-
-    def test_negative_rps_fails(self):
-        """Test that negative RPS fails."""
-        with pytest.raises(ValidationError, match="must be >= 1"):
-            validate_rps(-100)
+            validate_rps(rps)
 
 
 class TestValidateTestId:
@@ -429,6 +429,18 @@ class TestValidateRatioSum:
         
         # Should not raise
 
+    def test_failure_message_uses_failing_values(self):
+        """Test that the message lists the ratios as they were when validated."""
+        ratios = {"npm": 40, "pypi": 30, "maven": 20}
+        
+        with pytest.raises(ValidationError) as exc_info:
+            validate_ratio_sum(ratios, expected_sum=100)
+        ratios["maven"] = 30
+        
+        assert exc_info.value.args == (
+            "Ratios must sum to 100, got 90.00 (npm=40, pypi=30, maven=20)",
+        )
+
 
 class TestValidateNonEmptyString:
     """Tests for validate_non_empty_string."""